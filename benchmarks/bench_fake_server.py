@@ -0,0 +1,84 @@
+import argparse
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+
+import requests
+
+from youtube_community_tab import Client, AsyncClient, CommunityCrawler, AsyncCommunityCrawler, set_base_url
+from youtube_community_tab.fake_server import STATS_PATH
+
+
+def start_server(args):
+    # The server runs in its own process, so it doesn't compete with the crawler for the GIL
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    command = [sys.executable, "-m", "youtube_community_tab.fake_server", "--port", str(port), "--pages", str(args.pages), "--seed", "0"]
+    command += ["--latency", str(args.latency), "--throttle-rate", str(args.throttle_rate), "--error-rate", str(args.error_rate)]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    process.stdout.readline()
+
+    return process, f"http://127.0.0.1:{port}"
+
+
+def crawl(channels, max_workers, max_per_host):
+    client = Client(backend=None, memory_cache=None, max_per_host=max_per_host, backoff=0.01)
+    client.get_session().get_adapter("http://").poolmanager.connection_pool_kw["maxsize"] = max_workers
+
+    crawler = CommunityCrawler(channels, max_workers=max_workers, client=client)
+    return sum(1 for _ in crawler.crawl()), crawler.errors
+
+
+def crawl_async(channels, max_workers, max_per_host):
+    async def run():
+        client = AsyncClient(max_connections=max_workers, max_concurrency=max_per_host or max_workers, backoff=0.01)
+        crawler = AsyncCommunityCrawler(channels, max_workers=max_workers, client=client)
+
+        try:
+            return sum([1 async for _ in crawler.crawl()]), crawler.errors
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Crawls many channels of a local FakeYouTubeServer and reports the request rate")
+    parser.add_argument("--channels", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-per-host", type=int, default=None)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--use-async", action="store_true")
+    args = parser.parse_args(args)
+
+    channels = [f"channel{i}" for i in range(args.channels)]
+    process, url = start_server(args)
+    set_base_url(url)
+
+    try:
+        start = time.perf_counter()
+        num_posts, errors = (crawl_async if args.use_async else crawl)(channels, args.workers, args.max_per_host)
+        seconds = time.perf_counter() - start
+
+        stats = requests.get(url + STATS_PATH).json()
+    finally:
+        set_base_url()
+        process.terminate()
+        process.wait()
+
+    num_requests = sum(stats["requests"].values())
+    print(f"{num_posts} posts from {len(channels) - len(errors)}/{len(channels)} channels in {seconds:.2f} s")
+    print(f"{num_requests} requests | {num_requests / seconds:.0f} requests/s | at most {stats['max_in_flight']} at once")
+    print(f"status codes: {stats['status_codes']}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
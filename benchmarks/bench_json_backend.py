@@ -0,0 +1,69 @@
+import json
+import sys
+import time
+
+from youtube_community_tab.helpers import json_loads, json_dumps, get_json_backend, set_json_backend
+from youtube_community_tab.helpers.json_backend import JSON_BACKENDS
+
+
+def build_payload(num_items=500):
+    # Rough shape of a browse continuation response with a page of comment threads
+    items = [
+        {
+            "commentThreadRenderer": {
+                "comment": {
+                    "commentRenderer": {
+                        "commentId": f"Ugw{i}",
+                        "authorText": {"simpleText": f"@author{i}"},
+                        "authorEndpoint": {"browseEndpoint": {"browseId": f"UC{i:022d}"}},
+                        "contentText": {"runs": [{"text": "Some comment text, with some unicode: café ❤ "}] * 3},
+                        "publishedTimeText": {"runs": [{"text": "2 days ago"}]},
+                        "voteCount": {"simpleText": str(i)},
+                        "trackingParams": "CAEQ" * 20,
+                    }
+                }
+            }
+        }
+        for i in range(num_items)
+    ]
+
+    return json.dumps({"trackingParams": "CAAQ", "onResponseReceivedEndpoints": [{"appendContinuationItemsAction": {"continuationItems": items}}]}).encode()
+
+
+def bench(fn, arg, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(paths, repeat=20):
+    # paths are recorded response bodies (e.g. saved browse continuations)
+    if paths:
+        payloads = []
+        for path in paths:
+            with open(path, "rb") as f:
+                payloads.append((path, f.read()))
+    else:
+        payloads = [("synthetic", build_payload())]
+
+    previous = get_json_backend()
+
+    for name, content in payloads:
+        for backend, module in JSON_BACKENDS.items():
+            if module is None:
+                continue
+
+            set_json_backend(backend)
+            data = json_loads(content)
+
+            loads = bench(json_loads, content, repeat)
+            dumps = bench(json_dumps, data, repeat)
+
+            print(f"[{name}] {len(content) / 1e6:.2f} MB | {backend:6} | loads: {loads * 1000:.2f} ms | dumps: {dumps * 1000:.2f} ms")
+
+    set_json_backend(previous)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
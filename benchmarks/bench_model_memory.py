@@ -0,0 +1,81 @@
+import gc
+import json
+import sys
+import tracemalloc
+
+from youtube_community_tab.comment import Comment
+from youtube_community_tab.helpers import json_loads
+
+
+class DictComment(Comment):
+    # Same as Comment but with an instance __dict__, like the models were before __slots__
+    pass
+
+
+def build_payload(num_comments=50000, num_authors=500):
+    # Rough shape of comment renderers, the fields the models don't read are most of the size
+    renderers = []
+    for i in range(num_comments):
+        author = i % num_authors
+        renderers.append(
+            {
+                "commentId": f"Ugw{i:020d}",
+                "authorText": {"simpleText": f"@author{author}"},
+                "authorThumbnail": {
+                    "thumbnails": [
+                        {"url": f"https://yt3.ggpht.com/ytc/author{author}=s{size}-c-k-c0x00ffffff-no-rj", "width": size, "height": size}
+                        for size in (48, 88, 176)
+                    ]
+                },
+                "authorEndpoint": {
+                    "clickTrackingParams": "CAAQ" * 10,
+                    "commandMetadata": {"webCommandMetadata": {"url": f"/@author{author}", "webPageType": "WEB_PAGE_TYPE_CHANNEL", "rootVe": 3611}},
+                    "browseEndpoint": {"browseId": f"UC{author:022d}", "canonicalBaseUrl": f"/@author{author}"},
+                },
+                "contentText": {"runs": [{"text": f"comment number {i}"}]},
+                "publishedTimeText": {"runs": [{"text": "2 days ago", "navigationEndpoint": {"clickTrackingParams": "CAAQ" * 10}}]},
+                "isLiked": False,
+                "actionButtons": {
+                    "commentActionButtonsRenderer": {
+                        "likeButton": {"toggleButtonRenderer": {"trackingParams": "CAAQ" * 10, "accessibility": {"label": "Like"}}}
+                    }
+                },
+                "voteCount": {"simpleText": str(i % 100)},
+                "trackingParams": "CAEQ" * 20,
+                "loggingDirectives": {"trackingParams": "CAEQ" * 20, "visibility": {"types": "12"}},
+            }
+        )
+
+    return json.dumps(renderers).encode()
+
+
+def measure(comment_class, payload, keep_raw):
+    gc.collect()
+    tracemalloc.start()
+
+    # Decoded here so the strings are distinct objects, as they are when read from responses
+    renderers = json_loads(payload)
+    comments = [comment_class.from_data(data, "post_id", "channel_id", None, None, None, "0", keep_raw=keep_raw) for data in renderers]
+    del renderers
+    gc.collect()
+
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return len(comments), current
+
+
+def main(num_comments=50000):
+    payload = build_payload(num_comments)
+
+    for name, comment_class, keep_raw in [
+        ("__dict__, keep_raw=True", DictComment, True),
+        ("__slots__, keep_raw=True", Comment, True),
+        ("__slots__, keep_raw=False", Comment, False),
+    ]:
+        count, size = measure(comment_class, payload, keep_raw)
+        print(f"{name:28} | {count} comments | {size / 1e6:.1f} MB | {size / count:.0f} B/comment")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
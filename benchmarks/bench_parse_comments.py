@@ -0,0 +1,90 @@
+import os
+import sys
+import time
+
+from youtube_community_tab import Post, Reply
+from youtube_community_tab.schema import parse_comment_thread
+from youtube_community_tab.helpers import json_loads, iter_search_key, safely_get_value_from_key, intern_strings
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+REPLIES_CONTINUATION = ["replies", "commentRepliesRenderer", "contents", 0, "continuationItemRenderer", "continuationEndpoint"]
+
+
+def load_renderers(copies):
+    # commentThreadRenderer and commentRenderer items of every recorded youtubei response
+    threads = []
+    replies = []
+
+    for file_name in sorted(os.listdir(FIXTURES_DIR)):
+        if file_name.endswith(".json") and file_name != "index.json":
+            with open(os.path.join(FIXTURES_DIR, file_name), "rb") as f:
+                data = json_loads(f.read())
+
+            for item in iter_search_key("continuationItems", data, with_path=False):
+                threads += [item for item in item if "commentThreadRenderer" in item]
+                replies += [item["commentRenderer"] for item in item if "commentRenderer" in item]
+
+    return threads * copies, replies * copies
+
+
+def get_fields_walks(thread):
+    # What the models did before schema.py, one safely_get_value_from_key walk per field
+    data = thread["comment"]["commentRenderer"]
+
+    return {
+        "comment_id": data["commentId"],
+        "content_text": safely_get_value_from_key(data, "contentText"),
+        "author": intern_strings(
+            {
+                "authorText": safely_get_value_from_key(data, "authorText"),
+                "authorThumbnail": safely_get_value_from_key(data, "authorThumbnail"),
+                "authorEndpoint": safely_get_value_from_key(data, "authorEndpoint", "browseEndpoint"),
+                "authorIsChannelOwner": safely_get_value_from_key(data, "authorIsChannelOwner"),
+                "sponsorCommentBadge": safely_get_value_from_key(data, "sponsorCommentBadge"),
+            }
+        ),
+        "vote_count": safely_get_value_from_key(data, "voteCount"),
+        "replies_continuation_token": safely_get_value_from_key(thread, *REPLIES_CONTINUATION, "continuationCommand", "token"),
+        "click_tracking_params": safely_get_value_from_key(thread, *REPLIES_CONTINUATION, "clickTrackingParams"),
+    }
+
+
+def bench(fn, items, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(items)
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+
+    return len(items) / best
+
+
+def parse_threads(threads):
+    Post("post", channel_id="channel").append_comments_from_items(threads)
+
+
+def parse_replies(replies):
+    for data in replies:
+        Reply.from_data(data, keep_raw=False)
+
+
+def main(args, repeat=10):
+    copies = int(args[0]) if args else 50
+    threads, replies = load_renderers(copies)
+
+    for thread in [item["commentThreadRenderer"] for item in threads]:
+        assert get_fields_walks(thread) == parse_comment_thread(thread)
+
+    walks = bench(lambda items: [get_fields_walks(item["commentThreadRenderer"]) for item in items], threads, repeat)
+    direct = bench(lambda items: [parse_comment_thread(item["commentThreadRenderer"]) for item in items], threads, repeat)
+
+    print(f"fields, safely_get_value_from_key | {walks:10.0f} comments/s")
+    print(f"fields, parse_comment_thread      | {direct:10.0f} comments/s | speedup: {direct / walks:.2f}x")
+    print(f"append_comments_from_items        | {bench(parse_threads, threads, repeat):10.0f} comments/s")
+    print(f"Reply.from_data                   | {bench(parse_replies, replies, repeat):10.0f} replies/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,232 @@
+import argparse
+import gc
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+from youtube_community_tab import CommunityTab, Post, Comment, Reply, CommentActionBatch
+from youtube_community_tab.helpers import json_loads, json_dumps, extract_yt_initial_data
+from replay import FIXTURES_DIR, ReplayClient, load_index
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def load_all_posts(client, index):
+    ct = CommunityTab(index["channel_name"], client=client)
+    while ct.posts_continuation_token is not False:
+        ct.load_posts()
+
+    return len(ct.posts)
+
+
+def load_all_comments(client, index):
+    post = Post(index["post_id"], channel_id=index["channel_id"])
+    post.client = client
+
+    while post.comments_continuation_token is not False:
+        post.load_comments()
+
+    return post
+
+
+def load_all_replies(post, index):
+    # Only the reply threads that were recorded
+    num_replies = 0
+    for comment in post.comments:
+        if f"BROWSE_ENDPOINT {comment.replies_continuation_token}" not in index["responses"]:
+            continue
+
+        comment.load_all_replies()
+        num_replies += len(comment.replies)
+
+    return num_replies
+
+
+def get_renderers(fixtures_dir, index):
+    # The renderers of the fixtures, as from_data gets them: post renderers and comment renderers
+    posts, comments = [], []
+
+    for key, fixture in index["responses"].items():
+        with open(os.path.join(fixtures_dir, fixture["file"]), "rb") as f:
+            content = f.read()
+
+        if fixture["status_code"] != 200 or key.startswith("PERFORM_COMMENT_ACTION_ENDPOINT"):
+            continue
+
+        data = extract_yt_initial_data(content.decode("utf-8")) if fixture["file"].endswith(".html") else json_loads(content)
+        collect_renderers(data, posts, comments)
+
+    return posts, comments
+
+
+def collect_renderers(data, posts, comments):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key == "backstagePostThreadRenderer":
+                posts.append(value["post"])
+            elif key == "commentRenderer":
+                comments.append(value)
+            else:
+                collect_renderers(value, posts, comments)
+    elif isinstance(data, list):
+        for value in data:
+            collect_renderers(value, posts, comments)
+
+
+def timeit(fn, repeat):
+    # Best of repeat runs, fn returns (number of items, seconds)
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        num_items, seconds = fn()
+        best = seconds if best is None else min(best, seconds)
+
+    return {"items": num_items, "seconds": best, "items_per_second": num_items / best if best else 0.0}
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(fixtures_dir=FIXTURES_DIR, repeat=20):
+    index = load_index(fixtures_dir)
+    client = ReplayClient(fixtures_dir)
+    results = {}
+
+    def bench_load_posts():
+        return timed(load_all_posts, client, index)
+
+    def bench_load_comments():
+        post, seconds = timed(load_all_comments, client, index)
+        return len(post.comments), seconds
+
+    def bench_load_replies():
+        post = load_all_comments(client, index)
+        return timed(load_all_replies, post, index)
+
+    def bench_comment_actions():
+        post = load_all_comments(client, index)
+        start = time.perf_counter()
+        with CommentActionBatch(client=client) as batch:
+            for comment in post.comments:
+                batch.like(comment)
+        return len(batch.results), time.perf_counter() - start
+
+    post_renderers, comment_renderers = get_renderers(fixtures_dir, index)
+    post_payload = json_dumps(post_renderers)
+    comment_payload = json_dumps(comment_renderers)
+
+    def bench_post_from_data():
+        # from_data changes the renderers, they are decoded again before each run
+        renderers = json_loads(post_payload)
+        start = time.perf_counter()
+        for data in renderers:
+            Post.from_data(data)
+        return len(renderers), time.perf_counter() - start
+
+    def bench_comment_from_data():
+        renderers = json_loads(comment_payload)
+        start = time.perf_counter()
+        for data in renderers:
+            Comment.from_data(data, index["post_id"], index["channel_id"], None, None, None, "0")
+            Reply.from_data(data)
+        return 2 * len(renderers), time.perf_counter() - start
+
+    for name, fn in [
+        ("load_posts", bench_load_posts),
+        ("load_comments", bench_load_comments),
+        ("load_replies", bench_load_replies),
+        ("comment_actions", bench_comment_actions),
+        ("post_from_data", bench_post_from_data),
+        ("comment_from_data", bench_comment_from_data),
+    ]:
+        results[name] = timeit(fn, repeat)
+
+    results["memory"] = measure_memory(client, index)
+
+    return results
+
+
+def measure_memory(client, index):
+    # Memory kept by a loaded post with its comments and replies, and the peak while loading them
+    gc.collect()
+    tracemalloc.start()
+
+    post = load_all_comments(client, index)
+    load_all_replies(post, index)
+    gc.collect()
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"current_bytes": current, "peak_bytes": peak}
+
+
+def compare(results, baseline, threshold):
+    # Returns the names of the benchmarks slower (or bigger) than threshold times the baseline
+    regressions = []
+
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+
+        if name == "memory":
+            ratio = result["peak_bytes"] / baseline[name]["peak_bytes"]
+            print(f"{name:18} | {result['peak_bytes'] / 1e6:8.2f} MB peak | baseline {baseline[name]['peak_bytes'] / 1e6:8.2f} MB | x{ratio:.2f}")
+        else:
+            ratio = result["seconds"] / baseline[name]["seconds"]
+            print(f"{name:18} | {result['seconds'] * 1e3:8.2f} ms | baseline {baseline[name]['seconds'] * 1e3:8.2f} ms | x{ratio:.2f}")
+
+        if ratio > threshold:
+            regressions.append(name)
+
+    return regressions
+
+
+def print_results(results):
+    for name, result in results.items():
+        if name == "memory":
+            print(f"{name:18} | {result['current_bytes'] / 1e6:8.2f} MB kept | {result['peak_bytes'] / 1e6:8.2f} MB peak")
+        else:
+            print(f"{name:18} | {result['seconds'] * 1e3:8.2f} ms | {result['items']:6} items | {result['items_per_second']:10.0f} items/s")
+
+
+def main(args):
+    parser = argparse.ArgumentParser(description="Replays the recorded fixtures and compares the timings with the baseline")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save", action="store_true", help="save the results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.5, help="fail when a benchmark is this many times slower than the baseline")
+    args = parser.parse_args(args)
+
+    results = run(args.fixtures, args.repeat)
+    print_results(results)
+
+    if args.save:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(json_dumps({"python": platform.python_version(), "machine": platform.machine(), "results": results}, indent=True))
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"[There is no baseline at {args.baseline}, save one with --save]")
+        return 0
+
+    with open(args.baseline, "rb") as f:
+        baseline = json_loads(f.read())
+
+    print()
+    regressions = compare(results, baseline["results"], args.threshold)
+    if regressions:
+        print(f"[Slower than x{args.threshold} the baseline: {', '.join(regressions)}]")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
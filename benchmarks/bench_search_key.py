@@ -0,0 +1,66 @@
+import os
+import sys
+import time
+
+from youtube_community_tab.helpers import json_loads, search_key, iter_search_key, find_key
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def old_search_key(key, data, current_key=[]):
+    # The recursive implementation used before iter_search_key existed
+    found = []
+
+    if type(data).__name__ == "dict":
+        keys = list(data.keys())
+    elif type(data).__name__ == "list":
+        keys = list(range(len(data)))
+    else:
+        return []
+
+    if key in keys:
+        found.append((current_key + [key], data[key]))
+        keys.remove(key)
+
+    for k in keys:
+        found += old_search_key(key, data[k], current_key=current_key + [k])
+
+    return found
+
+
+def build_payload(copies=20):
+    # Every recorded youtubei response, nested a few levels deep as in the big browse responses
+    responses = []
+    for file_name in sorted(os.listdir(FIXTURES_DIR)):
+        if file_name.endswith(".json") and file_name != "index.json":
+            with open(os.path.join(FIXTURES_DIR, file_name), "rb") as f:
+                responses.append(json_loads(f.read()))
+
+    return {"onResponseReceivedEndpoints": [{"appendContinuationItemsAction": {"continuationItems": responses * copies}}]}
+
+
+def bench(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(args, repeat=5):
+    copies = int(args[0]) if args else 20
+    data = build_payload(copies)
+
+    for key in ["commentRenderer", "text", "status"]:
+        assert old_search_key(key, data) == search_key(key, data)
+
+        old = bench(lambda: old_search_key(key, data), repeat)
+        new = bench(lambda: search_key(key, data), repeat)
+        values = bench(lambda: list(iter_search_key(key, data, with_path=False)), repeat)
+        first = bench(lambda: find_key(key, data), repeat)
+
+        print(f"[{key}] {len(search_key(key, data))} matches | recursive: {old * 1000:.1f} ms | search_key: {new * 1000:.1f} ms", end="")
+        print(f" | values only: {values * 1000:.1f} ms | find_key: {first * 1000:.3f} ms | speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,60 @@
+import json
+import re
+import sys
+import time
+
+from youtube_community_tab.helpers import extract_yt_initial_data
+
+# The expression used before extract_yt_initial_data existed
+OLD_REGEX = "ytInitialData = ({(?:(?:.|\n)*)?});</script>"
+
+
+def old_extract(html):
+    m = re.findall(OLD_REGEX, html)
+    return json.loads(m[0])
+
+
+def build_page(num_items=2000):
+    # Rough shape of a channel page: big scripts around a big ytInitialData
+    items = [
+        {"backstagePostThreadRenderer": {"post": {"backstagePostRenderer": {"postId": f"Ugkx{i}", "contentText": {"runs": [{"text": "}{;</script> " * 5}]}}}}}
+        for i in range(num_items)
+    ]
+    data = {"contents": {"items": items}, "responseContext": {"visitorData": "x"}}
+
+    return "".join(
+        [
+            "<html><head><script>var ytcfg = " + json.dumps({"k": "v" * 200000}) + ";</script></head><body>",
+            '<script nonce="abc">var ytInitialData = ' + json.dumps(data) + ";</script>",
+            "<script>" + "window.foo = {};\n" * 20000 + "</script></body></html>",
+        ]
+    )
+
+
+def bench(fn, html, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(html)
+    return (time.perf_counter() - start) / repeat
+
+
+def main(paths, repeat=5):
+    if paths:
+        pages = []
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((path, f.read()))
+    else:
+        pages = [("synthetic", build_page())]
+
+    for name, html in pages:
+        assert old_extract(html) == extract_yt_initial_data(html)
+
+        old = bench(old_extract, html, repeat)
+        new = bench(extract_yt_initial_data, html, repeat)
+
+        print(f"[{name}] {len(html) / 1e6:.2f} MB | regex: {old * 1000:.1f} ms | extract_yt_initial_data: {new * 1000:.1f} ms | speedup: {old / new:.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
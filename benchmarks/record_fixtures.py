@@ -0,0 +1,78 @@
+import os
+import sys
+
+from youtube_community_tab import CommunityTab, Post, set_base_url
+from youtube_community_tab.fake_server import FakeYouTubeServer, get_post_id
+from youtube_community_tab.helpers import json_dumps
+from replay import FIXTURES_DIR, RecordingClient, save_index
+
+# Channel of the synthetic fixtures, used when the real site can't be recorded
+SYNTHETIC_CHANNEL_NAME = "benchmark"
+
+
+def record(channel_name, post_id, fixtures_dir=FIXTURES_DIR, num_pages=3, num_reply_threads=2):
+    # Records num_pages pages of posts, of comments of post_id and of replies of the first
+    # num_reply_threads threads. Loading goes through the RecordingClient, without any cache
+    client = RecordingClient(fixtures_dir)
+
+    ct = CommunityTab(channel_name, client=client)
+    for _ in range(num_pages):
+        ct.load_posts()
+
+    post = Post.from_post_id(post_id, client=client)
+    for _ in range(num_pages):
+        post.load_comments()
+
+    for comment in [comment for comment in post.comments if comment.replies_continuation_token][:num_reply_threads]:
+        for _ in range(num_pages):
+            comment.load_replies()
+
+    responses = dict(client.adapter.responses)
+    write_action_fixture(fixtures_dir, responses)
+
+    save_index({"channel_name": channel_name, "channel_id": ct.channel_id, "post_id": post_id, "responses": responses}, fixtures_dir)
+
+
+def write_action_fixture(fixtures_dir, responses):
+    # Comment actions change data, so the perform_comment_action response is never recorded
+    write_fixture(fixtures_dir, responses, "PERFORM_COMMENT_ACTION_ENDPOINT", "perform-comment-action.json", json_dumps(action_response()))
+
+
+def write_fixture(fixtures_dir, responses, key, file_name, body):
+    with open(os.path.join(fixtures_dir, file_name), "w", encoding="utf-8") as f:
+        f.write(body)
+
+    responses[key] = {"file": file_name, "status_code": 200}
+
+
+def action_response():
+    return {"responseContext": {}, "actionResults": [{"status": "STATUS_SUCCEEDED", "feedback": "FEEDBACK_LIKE"}]}
+
+
+def write_synthetic_fixtures(fixtures_dir=FIXTURES_DIR):
+    # Records a FakeYouTubeServer instead of the real site, its responses are shaped like the real ones
+    with FakeYouTubeServer() as server:
+        set_base_url(server.url)
+
+        try:
+            record(SYNTHETIC_CHANNEL_NAME, get_post_id(SYNTHETIC_CHANNEL_NAME, 0), fixtures_dir)
+        finally:
+            set_base_url()
+
+
+def main(args):
+    # python record_fixtures.py CHANNEL_NAME POST_ID records the real responses,
+    # python record_fixtures.py --synthetic records a local FakeYouTubeServer
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+
+    if args == ["--synthetic"]:
+        write_synthetic_fixtures()
+    elif len(args) == 2:
+        record(*args)
+    else:
+        print("[Usage: record_fixtures.py CHANNEL_NAME POST_ID | --synthetic]")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,124 @@
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+
+from youtube_community_tab.helpers import json_loads, json_dumps
+from youtube_community_tab.rate_limiter import get_endpoint
+from youtube_community_tab.requests_handler import Client, ThrottledAdapter
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+INDEX_FILE_NAME = "index.json"
+
+
+def get_fixture_key(request):
+    # Pages are identified by their path, youtubei requests by their endpoint and continuation
+    if request.method == "GET":
+        return f"GET {urlsplit(request.url).path}"
+
+    endpoint = get_endpoint(request.url)
+    continuation = json_loads(request.body).get("continuation") if request.body else None
+
+    return f"{endpoint} {continuation}" if continuation else endpoint
+
+
+def load_index(fixtures_dir=FIXTURES_DIR):
+    # {"channel_name": ..., "post_id": ..., "channel_id": ..., "responses": {key: {"file": ..., "status_code": ...}}}
+    with open(os.path.join(fixtures_dir, INDEX_FILE_NAME), "rb") as f:
+        return json_loads(f.read())
+
+
+def save_index(index, fixtures_dir=FIXTURES_DIR):
+    with open(os.path.join(fixtures_dir, INDEX_FILE_NAME), "w", encoding="utf-8") as f:
+        f.write(json_dumps(index, indent=True))
+
+
+class ReplayAdapter(HTTPAdapter):
+    # Stand-in transport answering every request with its recorded response, read once from the
+    # fixtures. Requests that weren't recorded get a 404. num_requests counts the replayed requests
+    def __init__(self, fixtures_dir=FIXTURES_DIR):
+        super().__init__()
+        self.index = load_index(fixtures_dir)
+        self.bodies = {}
+        self.num_requests = 0
+
+        for fixture in self.index["responses"].values():
+            if fixture["file"] not in self.bodies:
+                with open(os.path.join(fixtures_dir, fixture["file"]), "rb") as f:
+                    self.bodies[fixture["file"]] = f.read()
+
+    def send(self, request, **kwargs):
+        fixture = self.index["responses"].get(get_fixture_key(request))
+        self.num_requests += 1
+
+        response = requests.Response()
+        response.url = request.url
+        response.request = request
+        response.encoding = "utf-8"
+
+        if fixture is None:
+            response.status_code = 404
+            response._content = b""
+        else:
+            response.status_code = fixture["status_code"]
+            response._content = self.bodies[fixture["file"]]
+            response.headers["Content-Type"] = "text/html; charset=utf-8" if fixture["file"].endswith(".html") else "application/json; charset=UTF-8"
+
+        return response
+
+
+class ReplayClient(Client):
+    # Client replaying the fixtures, without any cache so every call goes through the transport
+    def __init__(self, fixtures_dir=FIXTURES_DIR, **kwargs):
+        self.fixtures_dir = fixtures_dir
+        self.adapter = None
+        super().__init__(backend=None, memory_cache=None, **kwargs)
+
+    def create_session(self):
+        session = super().create_session()
+
+        self.adapter = ReplayAdapter(self.fixtures_dir)
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+
+        return session
+
+
+class RecordingAdapter(ThrottledAdapter):
+    # The usual transport, also writing each response to the fixtures directory
+    def __init__(self, client, fixtures_dir=FIXTURES_DIR):
+        super().__init__(client)
+        self.fixtures_dir = fixtures_dir
+        self.responses = {}
+
+    def send(self, request, **kwargs):
+        response = super().send(request, **kwargs)
+
+        key = get_fixture_key(request)
+        extension = "html" if request.method == "GET" else "json"
+        file_name = f"{len(self.responses):03d}-{(get_endpoint(request.url) or 'page').lower().replace('_', '-')}.{extension}"
+
+        with open(os.path.join(self.fixtures_dir, file_name), "wb") as f:
+            f.write(response.content)
+
+        self.responses[key] = {"file": file_name, "status_code": response.status_code}
+
+        return response
+
+
+class RecordingClient(Client):
+    # Client recording the responses it gets from the network, nothing is cached so that
+    # every request is recorded
+    def __init__(self, fixtures_dir=FIXTURES_DIR, **kwargs):
+        self.fixtures_dir = fixtures_dir
+        self.adapter = None
+        super().__init__(backend=None, memory_cache=None, **kwargs)
+
+    def create_session(self):
+        session = super().create_session()
+
+        self.adapter = RecordingAdapter(self, self.fixtures_dir)
+        session.mount("https://", self.adapter)
+        session.mount("http://", self.adapter)
+
+        return session
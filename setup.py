@@ -15,8 +15,13 @@ setup(
     url="https://github.com/bot-jonas/youtube-community-tab",
     package_dir={"": "src"},
     install_requires=[
-        "requests_cache",
+        "requests_cache>=1.0",
     ],
+    extras_require={
+        "async": ["aiohttp"],
+        "fast": ["orjson"],
+        "zstd": ["zstandard"],
+    },
     packages=find_packages(where="src"),
     zip_safe=False,
 )
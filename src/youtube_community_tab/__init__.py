@@ -2,17 +2,49 @@ from . import (
     helpers,
 )
 
-from .comment import Comment
-from .community_tab import CommunityTab
-from .post import Post
+from .comment import Comment, AsyncComment
+from .comment_action_batch import CommentActionBatch
+from .community_tab import CommunityTab, AsyncCommunityTab, set_base_url
+from .post import Post, AsyncPost
 from .reply import Reply
-from .requests_handler import requests_cache
+from .crawler import CommunityCrawler, AsyncCommunityCrawler
+from .requests_handler import requests_cache, Client, set_cache_policy, get_cache_stats
+from .memory_cache import MemoryCache
+from .payload_cache import PayloadCache
+from .checkpoint_store import CheckpointStore
+from .storage import Storage
+from .exporter import JsonlExporter
+from .async_requests_handler import AsyncClient
+from .rate_limiter import RateLimiter
+from .metrics import MetricsRegistry
+from .helpers.json_backend import set_json_backend
+from .helpers.utils import set_keep_raw
 
 __all__ = [
     "helpers",
     "Comment",
+    "AsyncComment",
+    "CommentActionBatch",
     "CommunityTab",
+    "AsyncCommunityTab",
+    "set_base_url",
     "Post",
+    "AsyncPost",
     "Reply",
+    "CommunityCrawler",
+    "AsyncCommunityCrawler",
     "requests_cache",
+    "Client",
+    "MemoryCache",
+    "PayloadCache",
+    "CheckpointStore",
+    "Storage",
+    "JsonlExporter",
+    "set_cache_policy",
+    "get_cache_stats",
+    "AsyncClient",
+    "RateLimiter",
+    "MetricsRegistry",
+    "set_json_backend",
+    "set_keep_raw",
 ]
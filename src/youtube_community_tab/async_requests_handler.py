@@ -0,0 +1,157 @@
+import asyncio
+import time
+from http import cookiejar
+from requests.utils import dict_from_cookiejar
+
+from .helpers.json_backend import json_loads
+from .rate_limiter import get_backoff, get_endpoint, is_incomplete_response, is_retry_status, is_write
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncResponse(object):
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+
+    @property
+    def text(self):
+        return self.content.decode()
+
+    def json(self):
+        return json_loads(self.content)
+
+
+class AsyncClient(object):
+    # max_connections bounds the aiohttp connection pool, max_concurrency bounds
+    # how many requests are in flight at once across every object using the client.
+    # rate_limiter, retries, backoff, max_backoff and metrics work like in requests_handler.Client
+    def __init__(
+        self, max_connections=100, max_concurrency=10, cookies=None, timeout=30, rate_limiter=None, retries=3, backoff=0.5, max_backoff=30, metrics=None
+    ):
+        if aiohttp is None:
+            raise ImportError("[AsyncClient requires aiohttp, install it with `pip install youtube_community_tab[async]`]")
+
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.cookies = cookies if cookies is not None else cookiejar.CookieJar()
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.metrics = metrics
+
+        self.session = None
+        self.semaphore = None
+        self.loop = None
+        self.closer = None
+
+    def get_session(self):
+        # aiohttp sessions must be created inside a running event loop and can't be used from another
+        # one, so the client gets a new session when it's used from a new loop (another asyncio.run)
+        loop = asyncio.get_running_loop()
+
+        if self.session is None or self.session.closed or self.loop is not loop:
+            if self.session is not None and not self.session.closed:
+                # Its loop is closed, and its connections with it
+                self.session.detach()
+
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                cookies=dict_from_cookiejar(self.cookies),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+            self.loop = loop
+            self.closer = loop.create_task(self.close_on_cancel(self.session))
+
+        return self.session
+
+    @staticmethod
+    async def close_on_cancel(session):
+        # asyncio.run cancels the remaining tasks before closing its loop, so a session that isn't
+        # closed with close() (like the one of the default client) is still closed with its loop
+        try:
+            await asyncio.get_running_loop().create_future()
+        finally:
+            await session.close()
+
+    async def request(self, method, url, headers=None, json=None):
+        session = self.get_session()
+        start = time.perf_counter()
+
+        for attempt in range(self.retries + 1):
+            if self.rate_limiter is not None:
+                await asyncio.sleep(self.rate_limiter.reserve(url))
+
+            try:
+                async with self.semaphore:
+                    sent = time.perf_counter()
+                    async with session.request(method, url, headers=headers, json=json) as r:
+                        response = AsyncResponse(r.status, await r.read(), r.headers)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                # A ClientConnectorError means the connection couldn't be opened, the only failure
+                # the writes are retried on
+                if attempt == self.retries or (is_write(url) and not isinstance(e, aiohttp.ClientConnectorError)):
+                    raise e
+
+                await asyncio.sleep(get_backoff(attempt, self.backoff, self.max_backoff))
+                continue
+
+            self.observe(url, "network", sent, response)
+
+            retry = is_retry_status(url, response.status_code) or (response.status_code == 200 and is_incomplete_response(url, response.content))
+            if not retry or attempt == self.retries:
+                if self.rate_limiter is not None and response.status_code < 400:
+                    self.rate_limiter.succeeded(url)
+
+                self.observe(url, "request", start, response)
+                return response
+
+            if self.rate_limiter is not None and response.status_code == 429:
+                self.rate_limiter.throttled(url)
+
+            await asyncio.sleep(get_backoff(attempt, self.backoff, self.max_backoff, retry_after=response.headers.get("Retry-After")))
+
+    def observe(self, url, stage, start, response=None, cache=None):
+        if self.metrics is not None:
+            num_bytes = len(response.content) if response is not None else 0
+            self.metrics.observe(get_endpoint(url), stage, time.perf_counter() - start, num_bytes, cache)
+
+    async def get(self, url, headers=None):
+        return await self.request("GET", url, headers=headers)
+
+    async def post(self, url, json=None, headers=None):
+        return await self.request("POST", url, headers=headers, json=json)
+
+    async def close(self):
+        if self.closer is not None:
+            self.closer.cancel()
+            self.closer = None
+
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+
+default_async_client = None
+
+
+def get_default_async_client():
+    global default_async_client
+
+    if default_async_client is None:
+        default_async_client = AsyncClient()
+
+    return default_async_client
@@ -0,0 +1,80 @@
+import sqlite3
+import time
+from threading import Lock
+
+from .helpers.json_backend import json_loads, json_dumps
+
+
+class CheckpointStore(object):
+    # Keeps the pagination state of CommunityTab, Post and Comment objects (get_checkpoint) so an
+    # interrupted crawl can resume from the last saved page instead of the first one.
+    # path=None keeps the checkpoints in memory only
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = Lock()
+
+        self.connection = None
+        self.checkpoints = {}
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS checkpoints (key TEXT PRIMARY KEY, checkpoint TEXT, updated REAL)")
+            self.connection.commit()
+
+        return self.connection
+
+    def get(self, key):
+        with self.lock:
+            if self.path is None:
+                checkpoint = self.checkpoints.get(key)
+            else:
+                row = self.get_connection().execute("SELECT checkpoint FROM checkpoints WHERE key = ?", (key,)).fetchone()
+                checkpoint = row[0] if row is not None else None
+
+        return json_loads(checkpoint) if checkpoint is not None else None
+
+    def set(self, key, checkpoint):
+        checkpoint = json_dumps(checkpoint)
+
+        with self.lock:
+            if self.path is None:
+                self.checkpoints[key] = checkpoint
+            else:
+                connection = self.get_connection()
+                connection.execute("INSERT OR REPLACE INTO checkpoints (key, checkpoint, updated) VALUES (?, ?, ?)", (key, checkpoint, time.time()))
+                connection.commit()
+
+    def delete(self, key):
+        with self.lock:
+            if self.path is None:
+                self.checkpoints.pop(key, None)
+            else:
+                connection = self.get_connection()
+                connection.execute("DELETE FROM checkpoints WHERE key = ?", (key,))
+                connection.commit()
+
+    def save(self, obj):
+        self.set(obj.get_checkpoint_key(), obj.get_checkpoint())
+
+    def load(self, cls, object_id, client=None):
+        # Returns the cls object (CommunityTab, Post, Comment or their async versions) saved for
+        # object_id (channel_name, post_id or comment_id), None if there is no checkpoint
+        checkpoint = self.get(cls.CHECKPOINT_KEY.format(object_id))
+
+        return cls.from_checkpoint(checkpoint, client=client) if checkpoint is not None else None
+
+    def clear(self):
+        with self.lock:
+            self.checkpoints.clear()
+
+            if self.path is not None:
+                connection = self.get_connection()
+                connection.execute("DELETE FROM checkpoints")
+                connection.commit()
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -1,10 +1,18 @@
-import json
 from requests.utils import dict_from_cookiejar
 from base64 import urlsafe_b64encode
-
-from .requests_handler import requests_cache
-from .helpers.utils import safely_get_value_from_key, get_auth_header, CLIENT_VERSION
+from functools import lru_cache
+
+from .requests_handler import requests_cache, get_expire_after
+from .metrics import time_stage, load_json
+from .async_requests_handler import get_default_async_client
+from .helpers.json_backend import json_dumps
+from .helpers.protobuf import encode_message, encode_params
+from .helpers.utils import safely_get_value_from_key, get_auth_header, get_keep_raw, CLIENT_VERSION
 from .reply import Reply
+from .schema import parse_comment, parse_comment_thread
+
+# HARD_CODED: Sent in every perform_comment_action params, IDK
+ACTION_PARAMS_ID = "115587043600121621724"
 
 
 class Comment(object):
@@ -17,6 +25,34 @@ class Comment(object):
         "FIXED_COMMENT": "https://www.youtube.com/channel/{}/community?lc={}&lb={}",
     }
 
+    CHECKPOINT_KEY = "comment:{}"
+    CHECKPOINT_FIELDS = [
+        "post_id",
+        "comment_id",
+        "channel_id",
+        "replies_continuation_token",
+        "click_tracking_params",
+        "visitor_data",
+        "session_index",
+    ]
+
+    __slots__ = (
+        "post_id",
+        "comment_id",
+        "channel_id",
+        "author",
+        "content_text",
+        "vote_count",
+        "replies_continuation_token",
+        "click_tracking_params",
+        "visitor_data",
+        "session_index",
+        "replies",
+        "client",
+        "storage",
+        "raw_data",
+    )
+
     def __init__(
         self,
         post_id,
@@ -41,6 +77,9 @@ class Comment(object):
         self.visitor_data = visitor_data
         self.session_index = session_index
         self.replies = []
+        self.client = None
+        self.storage = None
+        self.raw_data = None
 
     def as_json(self):
         return {
@@ -53,7 +92,7 @@ class Comment(object):
         }
 
     def __str__(self):
-        return json.dumps(self.as_json(), indent=4)
+        return json_dumps(self.as_json(), indent=True)
 
     def __repr__(self):
         return self.__str__()
@@ -63,139 +102,188 @@ class Comment(object):
             return "".join([run["text"] for run in self.content_text["runs"]])
         return None
 
-    def load_replies(self, expire_after=0):
+    def get_client(self):
+        return self.client if self.client is not None else requests_cache
+
+    def load_replies(self, expire_after=None):
+        if self.replies_continuation_token:
+            client = self.get_client()
+            headers, json_body = self.get_continuation_request(self.get_headers(client.cookies))
+
+            r = client.post(
+                Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=get_expire_after("BROWSE_ENDPOINT", expire_after), headers=headers
+            )
+
+            data = load_json(client, "BROWSE_ENDPOINT", r.content)
+            with time_stage(client, "BROWSE_ENDPOINT", "from_data"):
+                self.load_replies_from_continuation(data)
+
+    def iter_replies(self, expire_after=None, keep=True, checkpoint_store=None):
+        # Lazily loads the remaining pages, yielding one reply at a time.
+        # With keep=False the replies are not appended to self.replies.
+        # With a checkpoint_store, the checkpoint is saved after the replies of each page were consumed
+        while self.replies_continuation_token:
+            num_replies = len(self.replies)
+            self.load_replies(expire_after=expire_after)
+
+            new_replies = self.replies[num_replies:]
+            if not keep:
+                del self.replies[num_replies:]
+
+            yield from new_replies
+
+            if checkpoint_store is not None:
+                checkpoint_store.save(self)
+
+    def get_checkpoint_key(self):
+        return self.CHECKPOINT_KEY.format(self.comment_id)
+
+    def get_checkpoint(self):
+        return {field: getattr(self, field) for field in self.CHECKPOINT_FIELDS}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint, client=None):
+        comment = cls(checkpoint["post_id"], checkpoint["comment_id"])
+        comment.client = client
+
+        for field in cls.CHECKPOINT_FIELDS:
+            setattr(comment, field, checkpoint[field])
+
+        return comment
+
+    def load_all_replies(self, expire_after=None):
+        # Follows the continuation chain of the thread until its last page
+        while self.replies_continuation_token:
+            self.load_replies(expire_after=expire_after)
+
+    def get_headers(self, cookies):
         headers = {
             "x-origin": "https://www.youtube.com",
             "Referer": Comment.FORMAT_URLS["POST"].format(self.post_id),
         }
 
         # Add authorization header
-        current_cookies = dict_from_cookiejar(requests_cache.cookies)
+        current_cookies = dict_from_cookiejar(cookies)
         if "SAPISID" in current_cookies:
             headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
 
-        if self.replies_continuation_token:
-            headers.update(
-                {
-                    "X-Goog-AuthUser": self.session_index,
-                    "X-Origin": "https://www.youtube.com",
-                    "X-Youtube-Client-Name": "1",
-                    "X-Youtube-Client-Version": CLIENT_VERSION,
-                }
-            )
+        return headers
 
-            json_body = {
-                "context": {
-                    "client": {
-                        "clientName": "WEB",
-                        "clientVersion": CLIENT_VERSION,
-                        "originalUrl": Comment.FORMAT_URLS["POST"].format(self.post_id),
-                        "visitorData": self.visitor_data,
-                    }
-                },
-                "continuation": self.replies_continuation_token,
-                "clickTracking": {"clickTrackingParams": self.click_tracking_params},
+    def get_continuation_request(self, headers):
+        headers.update(
+            {
+                "X-Goog-AuthUser": self.session_index,
+                "X-Origin": "https://www.youtube.com",
+                "X-Youtube-Client-Name": "1",
+                "X-Youtube-Client-Version": CLIENT_VERSION,
             }
+        )
 
-            r = requests_cache.post(Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=expire_after, headers=headers)
+        json_body = {
+            "context": {
+                "client": {
+                    "clientName": "WEB",
+                    "clientVersion": CLIENT_VERSION,
+                    "originalUrl": Comment.FORMAT_URLS["POST"].format(self.post_id),
+                    "visitorData": self.visitor_data,
+                }
+            },
+            "continuation": self.replies_continuation_token,
+            "clickTracking": {"clickTrackingParams": self.click_tracking_params},
+        }
+
+        return headers, json_body
 
-            data = r.json()
-            append = safely_get_value_from_key(data, "onResponseReceivedEndpoints", 0, "appendContinuationItemsAction", default=[])
-            self.click_tracking_params = data["trackingParams"]
-            continuation_items = safely_get_value_from_key(append, "continuationItems", default=[])
+    def load_replies_from_continuation(self, data):
+        append = safely_get_value_from_key(data, "onResponseReceivedEndpoints", 0, "appendContinuationItemsAction", default=[])
+        self.click_tracking_params = data["trackingParams"]
+        continuation_items = safely_get_value_from_key(append, "continuationItems", default=[])
 
-            self.append_replies_from_items(continuation_items)
+        self.append_replies_from_items(continuation_items)
 
     def append_replies_from_items(self, items):
+        num_replies = len(self.replies)
         there_is_no_continuation_token = True
         for item in items:
-            kind = list(item.keys())[0]
-
-            if kind == "commentRenderer":
-                self.replies.append(Reply.from_data(item[kind]))
-            elif kind == "continuationItemRenderer":
-                if "continuationEndpoint" in item[kind]:
-                    self.replies_continuation_token = item[kind]["continuationEndpoint"]["continuationCommand"]["token"]
+            if "commentRenderer" in item:
+                self.replies.append(Reply.from_data(item["commentRenderer"]))
+            elif "continuationItemRenderer" in item:
+                continuation = item["continuationItemRenderer"]
+                if "continuationEndpoint" in continuation:
+                    self.replies_continuation_token = continuation["continuationEndpoint"]["continuationCommand"]["token"]
                     there_is_no_continuation_token = False
-                elif "button" in item[kind]:
-                    self.replies_continuation_token = item[kind]["button"]["buttonRenderer"]["command"]["continuationCommand"]["token"]
+                elif "button" in continuation:
+                    self.replies_continuation_token = continuation["button"]["buttonRenderer"]["command"]["continuationCommand"]["token"]
                     there_is_no_continuation_token = False
 
         if there_is_no_continuation_token:
             self.replies_continuation_token = False
 
-    @staticmethod
-    def from_data(data, post_id, channel_id, replies_continuation_token, click_tracking_params, visitor_data, session_index):
-        comment = Comment(
+        if self.storage is not None:
+            self.storage.save_replies(self, self.replies[num_replies:])
+
+    @classmethod
+    def from_data(cls, data, post_id, channel_id, replies_continuation_token, click_tracking_params, visitor_data, session_index, keep_raw=None):
+        comment = cls(
             post_id,
-            data["commentId"],
             channel_id=channel_id,
-            content_text=safely_get_value_from_key(data, "contentText"),
-            author={
-                "authorText": safely_get_value_from_key(data, "authorText"),
-                "authorThumbnail": safely_get_value_from_key(data, "authorThumbnail"),
-                "authorEndpoint": safely_get_value_from_key(data, "authorEndpoint", "browseEndpoint"),
-                "authorIsChannelOwner": safely_get_value_from_key(data, "authorIsChannelOwner"),
-                "sponsorCommentBadge": safely_get_value_from_key(data, "sponsorCommentBadge"),
-            },
-            vote_count=safely_get_value_from_key(data, "voteCount"),
             replies_continuation_token=replies_continuation_token,
             click_tracking_params=click_tracking_params,
             visitor_data=visitor_data,
             session_index=session_index,
+            **parse_comment(data),
         )
 
-        comment.raw_data = data
+        if get_keep_raw(keep_raw):
+            comment.raw_data = data
+
+        return comment
+
+    @classmethod
+    def from_thread_data(cls, data, post_id, channel_id, visitor_data, session_index, keep_raw=None):
+        # A commentThreadRenderer, the comment and the continuation of its replies are read in one pass
+        comment = cls(post_id, channel_id=channel_id, visitor_data=visitor_data, session_index=session_index, **parse_comment_thread(data))
+
+        if get_keep_raw(keep_raw):
+            comment.raw_data = data["comment"]["commentRenderer"]
 
         return comment
 
     @staticmethod
     def get_fixed_comment_params(comment_id, post_id, channel_id):
-        part1 = [
-            b"\x12\tcommunity\xB8\x01\x00\xCA\x01",
-            (32 + len(post_id)).to_bytes(1, "big"),
-            b"\x82\x01",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"\xB2\x01",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"\xEA\x02\x04\x10\x01\x18\x01\xAA\x03",
-            (84 + len(post_id)).to_bytes(1, "big"),
-            b"\x22",
-            (64 + len(post_id)).to_bytes(1, "big"),
-            b"0\x00\x82\x01",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"\xD8\x01\x01\xEA\x01",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"\xF2\x01",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-            b"B\x10comments-section",
-        ]
-
-        part1 = urlsafe_b64encode(b"".join(part1)).replace(b"=", b"%3D")
-
-        params = [
-            b"\xe2\xa9\x85\xb2\x02",
-            (83 + 3 * len(post_id)).to_bytes(1, "big"),
-            b"\x02\x12",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-            b"\x1A",
-            (54 + 3 * len(post_id)).to_bytes(1, "big"),
-            b"\x02",
-            part1,
-        ]
-
-        params = urlsafe_b64encode(b"".join(params)).decode().replace("=", "%3D")
-
-        return params
+        part1 = encode_message(
+            [
+                (2, "community"),
+                (23, 0),
+                (25, [(16, comment_id), (22, post_id)]),
+                (45, [(2, 1), (3, 1)]),
+                (53, [(4, [(6, 0), (16, comment_id), (27, 1), (29, post_id), (30, channel_id)]), (8, "comments-section")]),
+            ]
+        )
+
+        part1 = urlsafe_b64encode(part1).replace(b"=", b"%3D")
+
+        return encode_params(encode_message([(80226972, [(2, channel_id), (3, part1)])]))
+
+    @classmethod
+    def from_ids(cls, comment_id, post_id, channel_id, expire_after=None, client=None):
+        request_client = client if client is not None else requests_cache
+        headers, json_body = Comment.get_from_ids_request(comment_id, post_id, channel_id, request_client.cookies)
+
+        r = request_client.post(
+            Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=get_expire_after("BROWSE_ENDPOINT", expire_after), headers=headers
+        )
+
+        data = load_json(request_client, "BROWSE_ENDPOINT", r.content)
+        with time_stage(request_client, "BROWSE_ENDPOINT", "from_data"):
+            comment = cls.from_fixed_comment_response(data, post_id, channel_id)
+        if comment is not None:
+            comment.client = client
+
+        return comment
 
     @staticmethod
-    def from_ids(comment_id, post_id, channel_id, expire_after=0):
+    def get_from_ids_request(comment_id, post_id, channel_id, cookies):
         fixed_comment_url = Comment.FORMAT_URLS["FIXED_COMMENT"].format(channel_id, comment_id, post_id)
         headers = {
             "x-origin": "https://www.youtube.com",
@@ -203,7 +291,7 @@ class Comment(object):
         }
 
         # Add authorization header
-        current_cookies = dict_from_cookiejar(requests_cache.cookies)
+        current_cookies = dict_from_cookiejar(cookies)
         if "SAPISID" in current_cookies:
             headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
 
@@ -220,73 +308,56 @@ class Comment(object):
             "continuation": c,
         }
 
-        r = requests_cache.post(Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=expire_after, headers=headers)
+        return headers, json_body
 
+    @classmethod
+    def from_fixed_comment_response(cls, data, post_id, channel_id):
         comment_data = safely_get_value_from_key(
-            r.json(), "onResponseReceivedEndpoints", 1, "reloadContinuationItemsCommand", "continuationItems", 0, "commentThreadRenderer"
+            data, "onResponseReceivedEndpoints", 1, "reloadContinuationItemsCommand", "continuationItems", 0, "commentThreadRenderer"
         )
 
         if comment_data is not None:
-            return Comment.from_data(
-                comment_data["comment"]["commentRenderer"],
-                post_id,
-                channel_id,
-                safely_get_value_from_key(
-                    comment_data,
-                    "replies",
-                    "commentRepliesRenderer",
-                    "contents",
-                    0,
-                    "continuationItemRenderer",
-                    "continuationEndpoint",
-                    "continuationCommand",
-                    "token",
-                ),
-                safely_get_value_from_key(
-                    comment_data,
-                    "replies",
-                    "commentRepliesRenderer",
-                    "contents",
-                    0,
-                    "continuationItemRenderer",
-                    "continuationEndpoint",
-                    "clickTrackingParams",
-                ),
-                None,
-                None,
-            )
+            return cls.from_thread_data(comment_data, post_id, channel_id, None, None)
 
     @staticmethod
     def get_update_comment_params(comment_id, post_id, channel_id):
-        params = [
-            b"\n",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"*\x02\b\x00@\x01R",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"Z",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-        ]
-
-        params = urlsafe_b64encode(b"".join(params)).decode().replace("=", "%3D")
-
-        return params
+        return encode_params(encode_message([(1, comment_id)]), Comment.get_update_comment_fields(post_id, channel_id))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_update_comment_fields(post_id, channel_id):
+        # The fields following the comment id, the same for all the comments of a post
+        return encode_message([(5, [(1, 0)]), (8, 1), (10, post_id), (11, channel_id)])
 
     def update_comment(self, comment_text):
-        return Comment._update_comment(comment_text, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id)
+        return Comment._update_comment(comment_text, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id, client=self.client)
 
     @staticmethod
-    def _update_comment(comment_text, update_comment_params=None, comment_id=None, post_id=None, channel_id=None):
+    def _update_comment(comment_text, update_comment_params=None, comment_id=None, post_id=None, channel_id=None, client=None):
         if update_comment_params is None:
             update_comment_params = Comment.get_update_comment_params(comment_id, post_id, channel_id)
 
+        if client is None:
+            client = requests_cache
+
+        headers, json_body = Comment.get_update_comment_request(comment_text, update_comment_params, client.cookies)
+
+        r = client.post(
+            Comment.FORMAT_URLS["UPDATE_COMMENT_ENDPOINT"],
+            json=json_body,
+            expire_after=get_expire_after("UPDATE_COMMENT_ENDPOINT"),
+            headers=headers,
+        )
+
+        return load_json(client, "UPDATE_COMMENT_ENDPOINT", r.content)
+
+    @staticmethod
+    def get_update_comment_request(comment_text, update_comment_params, cookies):
         headers = {
             "x-origin": "https://www.youtube.com",
         }
 
-        current_cookies = dict_from_cookiejar(requests_cache.cookies)
+        current_cookies = dict_from_cookiejar(cookies)
         if "SAPISID" in current_cookies:
             headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
 
@@ -301,112 +372,85 @@ class Comment(object):
             "commentText": comment_text,
         }
 
-        r = requests_cache.post(
-            Comment.FORMAT_URLS["UPDATE_COMMENT_ENDPOINT"],
-            json=json_body,
-            headers=headers,
-        )
-
-        return r.json()
+        return headers, json_body
 
     @staticmethod
     def get_delete_comment_params(comment_id, post_id, channel_id):
-        params = [
-            b"\b\x06\x10\x07\x1A",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"0\x00J\x15115587043600121621724P\x00\xA8\x01\x01\xB2\x01",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"\xBA\x01",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-            b"\xF0\x01\x01",
-        ]
-
-        params = urlsafe_b64encode(b"".join(params)).decode().replace("=", "%3D")
-
-        return params
+        return encode_params(encode_message([(1, 6), (2, 7), (3, comment_id), (6, 0)]), Comment.get_action_fields(post_id, channel_id))
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_action_fields(post_id, channel_id):
+        # The fields following the comment id and the value in the perform_comment_action params,
+        # the same for all the comments of a post
+        return encode_message([(9, ACTION_PARAMS_ID), (10, 0), (21, 1), (22, post_id), (23, channel_id), (30, 1)])
 
     def delete_comment(self):
-        return Comment._delete_comment(comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id)
+        return Comment._delete_comment(comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id, client=self.client)
 
     @staticmethod
-    def _delete_comment(delete_comment_params=None, comment_id=None, post_id=None, channel_id=None):
+    def _delete_comment(delete_comment_params=None, comment_id=None, post_id=None, channel_id=None, client=None):
         if delete_comment_params is None:
             delete_comment_params = Comment.get_delete_comment_params(comment_id, post_id, channel_id)
 
-        return Comment.perform_action(delete_comment_params)
+        return Comment.perform_action(delete_comment_params, client=client)
 
     @staticmethod
     def get_dislike_comment_params(value, comment_id, post_id, channel_id):
-        params = [
-            b"\b\x04\x10\x07\x1A",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"0\x008",
-            (not value).to_bytes(1, "big"),
-            b"J\x15115587043600121621724P\x00\xA8\x01\x01\xB2\x01",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"\xBA\x01",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-            b"\xF0\x01\x01",
-        ]
-
-        params = urlsafe_b64encode(b"".join(params)).decode().replace("=", "%3D")
-
-        return params
+        return encode_params(encode_message([(1, 4), (2, 7), (3, comment_id), (6, 0), (7, not value)]), Comment.get_action_fields(post_id, channel_id))
 
     def set_dislike_comment(self, value=True):
-        return Comment._set_dislike_comment(value, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id)
+        return Comment._set_dislike_comment(value, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id, client=self.client)
 
     @staticmethod
-    def _set_dislike_comment(value, dislike_comment_params=None, comment_id=None, post_id=None, channel_id=None):
+    def _set_dislike_comment(value, dislike_comment_params=None, comment_id=None, post_id=None, channel_id=None, client=None):
         if dislike_comment_params is None:
             dislike_comment_params = Comment.get_dislike_comment_params(value, comment_id, post_id, channel_id)
 
-        return Comment.perform_action(dislike_comment_params)
+        return Comment.perform_action(dislike_comment_params, client=client)
 
     @staticmethod
     def get_like_comment_params(value, comment_id, post_id, channel_id):
-        params = [
-            b"\b\x05\x10\x07\x1A",
-            len(comment_id).to_bytes(1, "big"),
-            comment_id.encode(),
-            b"0\x008",
-            (not value).to_bytes(1, "big"),
-            b"J\x15115587043600121621724P\x00\xA8\x01\x01\xB2\x01",
-            len(post_id).to_bytes(1, "big"),
-            post_id.encode(),
-            b"\xBA\x01",
-            len(channel_id).to_bytes(1, "big"),
-            channel_id.encode(),
-            b"\xF0\x01\x01",
-        ]
-
-        params = urlsafe_b64encode(b"".join(params)).decode().replace("=", "%3D")
-
-        return params
+        return encode_params(encode_message([(1, 5), (2, 7), (3, comment_id), (6, 0), (7, not value)]), Comment.get_action_fields(post_id, channel_id))
 
     def set_like_comment(self, value=True):
-        return Comment._set_like_comment(value, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id)
+        return Comment._set_like_comment(value, comment_id=self.comment_id, post_id=self.post_id, channel_id=self.channel_id, client=self.client)
 
     @staticmethod
-    def _set_like_comment(value, like_comment_params=None, comment_id=None, post_id=None, channel_id=None):
+    def _set_like_comment(value, like_comment_params=None, comment_id=None, post_id=None, channel_id=None, client=None):
         if like_comment_params is None:
             like_comment_params = Comment.get_like_comment_params(value, comment_id, post_id, channel_id)
 
-        return Comment.perform_action(like_comment_params)
+        return Comment.perform_action(like_comment_params, client=client)
 
     @staticmethod
-    def perform_action(action_params):
+    def perform_action(action_params, client=None):
+        return Comment.perform_actions([action_params], client=client)
+
+    @staticmethod
+    def perform_actions(actions_params, client=None):
+        # Sends many actions (get_*_comment_params) in a single request, see CommentActionBatch
+        if client is None:
+            client = requests_cache
+
+        headers, json_body = Comment.get_perform_actions_request(actions_params, client.cookies)
+
+        r = client.post(
+            Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"],
+            json=json_body,
+            expire_after=get_expire_after("PERFORM_COMMENT_ACTION_ENDPOINT"),
+            headers=headers,
+        )
+
+        return load_json(client, "PERFORM_COMMENT_ACTION_ENDPOINT", r.content)
+
+    @staticmethod
+    def get_perform_actions_request(actions_params, cookies):
         headers = {
             "x-origin": "https://www.youtube.com",
         }
 
-        current_cookies = dict_from_cookiejar(requests_cache.cookies)
+        current_cookies = dict_from_cookiejar(cookies)
         if "SAPISID" in current_cookies:
             headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
 
@@ -417,15 +461,98 @@ class Comment(object):
                     "clientVersion": CLIENT_VERSION,
                 },
             },
-            "actions": [
-                action_params,
-            ],
+            "actions": list(actions_params),
         }
 
-        r = requests_cache.post(
-            Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"],
-            json=json_body,
-            headers=headers,
-        )
+        return headers, json_body
+
+
+class AsyncComment(Comment):
+    __slots__ = ()
+
+    def get_client(self):
+        return self.client if self.client is not None else get_default_async_client()
+
+    async def load_replies(self):
+        if self.replies_continuation_token:
+            client = self.get_client()
+            headers, json_body = self.get_continuation_request(self.get_headers(client.cookies))
+
+            r = await client.post(Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, headers=headers)
+
+            data = load_json(client, "BROWSE_ENDPOINT", r.content)
+            with time_stage(client, "BROWSE_ENDPOINT", "from_data"):
+                self.load_replies_from_continuation(data)
+
+    async def iter_replies(self, keep=True, checkpoint_store=None):
+        while self.replies_continuation_token:
+            num_replies = len(self.replies)
+            await self.load_replies()
+
+            new_replies = self.replies[num_replies:]
+            if not keep:
+                del self.replies[num_replies:]
+
+            for reply in new_replies:
+                yield reply
+
+            if checkpoint_store is not None:
+                checkpoint_store.save(self)
+
+    async def load_all_replies(self):
+        while self.replies_continuation_token:
+            await self.load_replies()
+
+    @classmethod
+    async def from_ids(cls, comment_id, post_id, channel_id, client=None):
+        request_client = client if client is not None else get_default_async_client()
+        headers, json_body = Comment.get_from_ids_request(comment_id, post_id, channel_id, request_client.cookies)
+
+        r = await request_client.post(Comment.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, headers=headers)
+
+        data = load_json(request_client, "BROWSE_ENDPOINT", r.content)
+        with time_stage(request_client, "BROWSE_ENDPOINT", "from_data"):
+            comment = cls.from_fixed_comment_response(data, post_id, channel_id)
+        if comment is not None:
+            comment.client = client
+
+        return comment
+
+    async def update_comment(self, comment_text):
+        client = self.get_client()
+        update_comment_params = Comment.get_update_comment_params(self.comment_id, self.post_id, self.channel_id)
+        headers, json_body = Comment.get_update_comment_request(comment_text, update_comment_params, client.cookies)
+
+        r = await client.post(Comment.FORMAT_URLS["UPDATE_COMMENT_ENDPOINT"], json=json_body, headers=headers)
+
+        return load_json(client, "UPDATE_COMMENT_ENDPOINT", r.content)
+
+    async def delete_comment(self):
+        action_params = Comment.get_delete_comment_params(self.comment_id, self.post_id, self.channel_id)
+
+        return await AsyncComment.perform_action(action_params, client=self.get_client())
+
+    async def set_dislike_comment(self, value=True):
+        action_params = Comment.get_dislike_comment_params(value, self.comment_id, self.post_id, self.channel_id)
+
+        return await AsyncComment.perform_action(action_params, client=self.get_client())
+
+    async def set_like_comment(self, value=True):
+        action_params = Comment.get_like_comment_params(value, self.comment_id, self.post_id, self.channel_id)
+
+        return await AsyncComment.perform_action(action_params, client=self.get_client())
+
+    @staticmethod
+    async def perform_action(action_params, client=None):
+        return await AsyncComment.perform_actions([action_params], client=client)
+
+    @staticmethod
+    async def perform_actions(actions_params, client=None):
+        if client is None:
+            client = get_default_async_client()
+
+        headers, json_body = Comment.get_perform_actions_request(actions_params, client.cookies)
+
+        r = await client.post(Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"], json=json_body, headers=headers)
 
-        return r.json()
+        return load_json(client, "PERFORM_COMMENT_ACTION_ENDPOINT", r.content)
@@ -0,0 +1,70 @@
+from .comment import Comment
+from .helpers.utils import safely_get_value_from_key
+
+
+class CommentActionBatch(object):
+    # Collects like, dislike and delete actions and sends them batch_size at a time, each chunk
+    # in a single perform_comment_action request instead of one request per action.
+    # flush() returns one result per action, in the order they were added:
+    # {"action": "like", "comment_id": ..., "status": "STATUS_SUCCEEDED"}, status is None when
+    # the response has no result for the action. Used as a context manager, it flushes on exit
+    def __init__(self, client=None, batch_size=50):
+        self.client = client
+        self.batch_size = batch_size
+
+        self.pending = []
+        self.results = []
+
+    def add(self, action, comment_id, action_params):
+        self.pending.append((action, comment_id, action_params))
+
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def like(self, comment, value=True):
+        self.add(
+            "like" if value else "unlike",
+            comment.comment_id,
+            Comment.get_like_comment_params(value, comment.comment_id, comment.post_id, comment.channel_id),
+        )
+
+    def dislike(self, comment, value=True):
+        self.add(
+            "dislike" if value else "undislike",
+            comment.comment_id,
+            Comment.get_dislike_comment_params(value, comment.comment_id, comment.post_id, comment.channel_id),
+        )
+
+    def delete(self, comment):
+        self.add("delete", comment.comment_id, Comment.get_delete_comment_params(comment.comment_id, comment.post_id, comment.channel_id))
+
+    def flush(self):
+        results = []
+
+        while len(self.pending) > 0:
+            chunk = self.pending[: self.batch_size]
+
+            # The chunk stays pending if the request fails, so flush can be called again
+            data = Comment.perform_actions([action_params for _, _, action_params in chunk], client=self.client)
+            del self.pending[: len(chunk)]
+
+            statuses = CommentActionBatch.get_statuses(data, len(chunk))
+            results.extend({"action": action, "comment_id": comment_id, "status": status} for (action, comment_id, _), status in zip(chunk, statuses))
+
+        self.results.extend(results)
+
+        return results
+
+    @staticmethod
+    def get_statuses(data, num_actions):
+        # actionResults has one {"status": ..., "feedback": ...} per action, in the request order
+        action_results = safely_get_value_from_key(data, "actionResults", default=[])
+
+        return [safely_get_value_from_key(action_results, i, "status") for i in range(num_actions)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        if exc_type is None:
+            self.flush()
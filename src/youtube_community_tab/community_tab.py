@@ -1,10 +1,32 @@
-import json
 import re
 from requests.utils import dict_from_cookiejar
 
-from .helpers.utils import safely_get_value_from_key, get_auth_header, CLIENT_VERSION, search_key
-from .requests_handler import requests_cache
-from .post import Post
+from .helpers.utils import safely_get_value_from_key, get_auth_header, extract_yt_initial_data, CLIENT_VERSION
+from .requests_handler import requests_cache, get_expire_after
+from .metrics import time_stage, load_json
+from .async_requests_handler import get_default_async_client
+from .post import Post, AsyncPost
+from .comment import Comment
+
+# Scheme and host of the FORMAT_URLS of CommunityTab, Post and Comment, the async classes share them
+BASE_URL = "https://www.youtube.com"
+
+
+def get_base_url():
+    return BASE_URL
+
+
+def set_base_url(base_url="https://www.youtube.com"):
+    # Sends every request to another server, e.g. set_base_url(FakeYouTubeServer().start().url)
+    global BASE_URL
+    base_url = base_url.rstrip("/")
+
+    for format_urls in [CommunityTab.FORMAT_URLS, Post.FORMAT_URLS, Comment.FORMAT_URLS]:
+        for name, url in format_urls.items():
+            if url.startswith(BASE_URL):
+                format_urls[name] = base_url + url[len(BASE_URL) :]
+
+    BASE_URL = base_url
 
 
 class CommunityTab(object):
@@ -15,12 +37,26 @@ class CommunityTab(object):
     }
 
     REGEX = {
-        "YT_INITIAL_DATA": "ytInitialData = ({(?:(?:.|\n)*)?});</script>",
         "COMMUNITY_TAB_URL": "^\/.*\/posts$",
     }
 
-    def __init__(self, channel_name):
+    POST_CLASS = Post
+
+    CHECKPOINT_KEY = "community_tab:{}"
+    CHECKPOINT_FIELDS = [
+        "channel_name",
+        "channel_id",
+        "community_url",
+        "posts_continuation_token",
+        "click_tracking_params",
+        "visitor_data",
+        "session_index",
+    ]
+
+    def __init__(self, channel_name, client=None, storage=None):
         self.channel_name = channel_name
+        self.client = client
+        self.storage = storage
 
         self.posts_continuation_token = None
         self.click_tracking_params = None
@@ -30,113 +66,191 @@ class CommunityTab(object):
         self.community_url = None
         self.channel_id = None
 
-    def load_posts(self, expire_after=0):
-        headers = {"Referer": self.community_url}
+    def get_client(self):
+        return self.client if self.client is not None else requests_cache
 
-        # Add authorization header
-        current_cookies = dict_from_cookiejar(requests_cache.cookies)
-        if "SAPISID" in current_cookies:
-            headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
+    def load_posts(self, expire_after=None):
+        client = self.get_client()
+        headers = self.get_headers(client.cookies)
 
         if self.posts_continuation_token is None:
             try:
                 # Get posts from community tab enpoint
+                expire_after = get_expire_after("COMMUNITY_TAB", expire_after)
                 self.community_url = CommunityTab.FORMAT_URLS["COMMUNITY_TAB"].format("c", self.channel_name)
-                r = requests_cache.get(self.community_url, expire_after=expire_after, headers=headers)
-                if r.status_code != 200:
+                status_code, data = client.get_initial_data(self.community_url, trim=CommunityTab.trim_initial_data, expire_after=expire_after, headers=headers)
+                if status_code != 200:
                     self.community_url = CommunityTab.FORMAT_URLS["COMMUNITY_TAB"].format("channel", self.channel_name)
-                    r = requests_cache.get(self.community_url, expire_after=expire_after, headers=headers)
+                    status_code, data = client.get_initial_data(
+                        self.community_url, trim=CommunityTab.trim_initial_data, expire_after=expire_after, headers=headers
+                    )
 
-                if r.status_code != 200:
+                if status_code != 200:
                     import sys
 
                     print(f"[Can't get data from the channel_name: {self.channel_name}]")
                     sys.exit()
-
-                m = re.findall(CommunityTab.REGEX["YT_INITIAL_DATA"], r.text)
-                data = json.loads(m[0])
-
-                if self.channel_id is None:
-                    self.channel_id = data["metadata"]["channelMetadataRenderer"]["externalId"]
-
             except IndexError as e:
-                print("[Can't find yt_initial_data using the regex]")
+                print("[Can't find yt_initial_data in the page]")
                 raise e
-            except json.decoder.JSONDecodeError as e:
-                print("[Can't parse yt_initial_data from the regex]")
+            except ValueError as e:
+                print("[Can't parse yt_initial_data from the page]")
                 raise e
             except Exception as e:
                 print("[Some non-expected exception, probably caused by requests...]")
                 raise e
 
-            tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
-            community_tab = CommunityTab.get_community_tab(tabs)
-            community_tab_items = CommunityTab.get_items_from_community_tab(community_tab)
-
-            self.click_tracking_params = CommunityTab.get_click_tracking_params_from_community_tab(community_tab)
-            self.visitor_data = data["responseContext"]["webResponseContextExtensionData"]["ytConfigData"]["visitorData"]
-            self.session_index = str(
-                safely_get_value_from_key(data["responseContext"]["webResponseContextExtensionData"]["ytConfigData"], "sessionIndex", default="")
-            )
-            self.append_posts_from_items(community_tab_items)
+            with time_stage(client, "COMMUNITY_TAB", "from_data"):
+                self.load_posts_from_initial_data(data)
         elif self.posts_continuation_token is not False:
-            headers.update(
-                {
-                    "X-Goog-AuthUser": self.session_index,
-                    "X-Origin": "https://www.youtube.com",
-                    "X-Youtube-Client-Name": "1",
-                    "X-Youtube-Client-Version": CLIENT_VERSION,
-                }
+            headers, json_body = self.get_continuation_request(headers)
+
+            r = client.post(
+                CommunityTab.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=get_expire_after("BROWSE_ENDPOINT", expire_after), headers=headers
             )
 
-            json_body = {
-                "context": {
-                    "client": {"clientName": "WEB", "clientVersion": CLIENT_VERSION, "originalUrl": self.community_url, "visitorData": self.visitor_data}
-                },
-                "continuation": self.posts_continuation_token,
-                "clickTracking": {"clickTrackingParams": self.click_tracking_params},
+            data = load_json(client, "BROWSE_ENDPOINT", r.content)
+            with time_stage(client, "BROWSE_ENDPOINT", "from_data"):
+                self.load_posts_from_continuation(data)
+
+    def iter_posts(self, expire_after=None, keep=True, checkpoint_store=None):
+        # Lazily loads the remaining pages, yielding one post at a time.
+        # With keep=False the posts are not appended to self.posts.
+        # With a checkpoint_store, the checkpoint is saved after the posts of each page were consumed
+        while self.posts_continuation_token is not False:
+            num_posts = len(self.posts)
+            self.load_posts(expire_after=expire_after)
+
+            new_posts = self.posts[num_posts:]
+            if not keep:
+                del self.posts[num_posts:]
+
+            yield from new_posts
+
+            if checkpoint_store is not None:
+                checkpoint_store.save(self)
+
+    def iter_new_posts(self, seen_post_ids, expire_after=None, keep=True, max_seen=2):
+        # Incremental sync: yields the posts that aren't in seen_post_ids (newest first) and stops
+        # paginating once max_seen posts in a row were already seen. It's more than one by default
+        # so an old pinned post at the top doesn't stop the sync
+        seen_post_ids = set(seen_post_ids)
+        num_seen = 0
+
+        for post in self.iter_posts(expire_after=expire_after, keep=keep):
+            if post.post_id not in seen_post_ids:
+                num_seen = 0
+                yield post
+            else:
+                num_seen += 1
+                if num_seen >= max_seen:
+                    return
+
+    def get_checkpoint_key(self):
+        return self.CHECKPOINT_KEY.format(self.channel_name)
+
+    def get_checkpoint(self):
+        # Pagination state, enough to resume load_posts() after a restart
+        return {field: getattr(self, field) for field in self.CHECKPOINT_FIELDS}
+
+    @classmethod
+    def from_checkpoint(cls, checkpoint, client=None):
+        ct = cls(checkpoint["channel_name"])
+        ct.client = client
+
+        for field in cls.CHECKPOINT_FIELDS:
+            setattr(ct, field, checkpoint[field])
+
+        return ct
+
+    def get_headers(self, cookies):
+        # There is no referer for the first page
+        headers = {"Referer": self.community_url} if self.community_url is not None else {}
+
+        # Add authorization header
+        current_cookies = dict_from_cookiejar(cookies)
+        if "SAPISID" in current_cookies:
+            headers["Authorization"] = get_auth_header(current_cookies["SAPISID"])
+
+        return headers
+
+    def get_continuation_request(self, headers):
+        headers.update(
+            {
+                "X-Goog-AuthUser": self.session_index,
+                "X-Origin": "https://www.youtube.com",
+                "X-Youtube-Client-Name": "1",
+                "X-Youtube-Client-Version": CLIENT_VERSION,
             }
+        )
+
+        json_body = {
+            "context": {"client": {"clientName": "WEB", "clientVersion": CLIENT_VERSION, "originalUrl": self.community_url, "visitorData": self.visitor_data}},
+            "continuation": self.posts_continuation_token,
+            "clickTracking": {"clickTrackingParams": self.click_tracking_params},
+        }
+
+        return headers, json_body
+
+    def load_posts_from_initial_data(self, data):
+        if self.channel_id is None:
+            self.channel_id = data["metadata"]["channelMetadataRenderer"]["externalId"]
 
-            r = requests_cache.post(CommunityTab.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, expire_after=expire_after, headers=headers)
+        tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
+        community_tab = CommunityTab.get_community_tab(tabs)
+        community_tab_items = CommunityTab.get_items_from_community_tab(community_tab)
 
-            data = r.json()
-            append = data["onResponseReceivedEndpoints"][0]["appendContinuationItemsAction"]
-            self.click_tracking_params = data["onResponseReceivedEndpoints"][0]["clickTrackingParams"]
-            self.append_posts_from_items(safely_get_value_from_key(append, "continuationItems", default=[]))
+        self.click_tracking_params = CommunityTab.get_click_tracking_params_from_community_tab(community_tab)
+        self.visitor_data = data["responseContext"]["webResponseContextExtensionData"]["ytConfigData"]["visitorData"]
+        self.session_index = str(
+            safely_get_value_from_key(data["responseContext"]["webResponseContextExtensionData"]["ytConfigData"], "sessionIndex", default="")
+        )
+        self.append_posts_from_items(community_tab_items)
+
+    def load_posts_from_continuation(self, data):
+        append = data["onResponseReceivedEndpoints"][0]["appendContinuationItemsAction"]
+        self.click_tracking_params = data["onResponseReceivedEndpoints"][0]["clickTrackingParams"]
+        self.append_posts_from_items(safely_get_value_from_key(append, "continuationItems", default=[]))
 
     def append_posts_from_items(self, items):
+        num_posts = len(self.posts)
         there_is_no_continuation_token = True
         for item in items:
-            kind = list(item.keys())[0]
-
-            if kind == "backstagePostThreadRenderer":
-                post_kind = list(item[kind]["post"].keys())[0]
-                if post_kind == "backstagePostRenderer":
-                    post_data = item[kind]["post"]["backstagePostRenderer"]
-                    post_data["channelId"] = self.channel_id
-                    self.posts.append(Post.from_data(post_data))
-                elif post_kind == "sharedPostRenderer":
-                    # TODO: parse data from item[kind]["post"]["sharedPostRenderer"]["originalPost"]["backstagePostRenderer"]
-                    post_data = item[kind]["post"]["sharedPostRenderer"]
-                    post_data["channelId"] = self.channel_id
-                    post_data["authorText"] = post_data["displayName"]
-                    post_data["authorEndpoint"] = post_data["endpoint"]
-                    post_data.pop("displayName")
-                    post_data.pop("endpoint")
-                    self.posts.append(Post.from_data(post_data))
-                else:
-                    raise Exception(f"[post_kind={post_kind} is not implemented yet!]")
-            elif kind == "continuationItemRenderer":
-                self.posts_continuation_token = item[kind]["continuationEndpoint"]["continuationCommand"]["token"]
+            if "backstagePostThreadRenderer" in item:
+                # Post.from_data handles both backstagePostRenderer and sharedPostRenderer
+                post = self.POST_CLASS.from_data(item["backstagePostThreadRenderer"]["post"])
+                post.client = self.client
+                post.storage = self.storage
+                self.posts.append(post)
+            elif "continuationItemRenderer" in item:
+                self.posts_continuation_token = item["continuationItemRenderer"]["continuationEndpoint"]["continuationCommand"]["token"]
                 there_is_no_continuation_token = False
 
         if there_is_no_continuation_token:
             self.posts_continuation_token = False
 
+        if self.storage is not None:
+            self.storage.save_posts(self.posts[num_posts:])
+
+    @staticmethod
+    def trim_initial_data(data):
+        # Keeps only what load_posts_from_initial_data reads, in the same structure
+        tabs = data["contents"]["twoColumnBrowseResultsRenderer"]["tabs"]
+
+        return {
+            "metadata": {"channelMetadataRenderer": {"externalId": data["metadata"]["channelMetadataRenderer"]["externalId"]}},
+            "contents": {"twoColumnBrowseResultsRenderer": {"tabs": [CommunityTab.get_community_tab(tabs)]}},
+            "responseContext": {
+                "webResponseContextExtensionData": {"ytConfigData": data["responseContext"]["webResponseContextExtensionData"]["ytConfigData"]}
+            },
+        }
+
     @staticmethod
     def get_community_tab(tabs):
         for tab in tabs:
-            if "tabRenderer" in tab and re.match(CommunityTab.REGEX["COMMUNITY_TAB_URL"], tab["tabRenderer"]["endpoint"]["commandMetadata"]["webCommandMetadata"]["url"]):
+            if "tabRenderer" in tab and re.match(
+                CommunityTab.REGEX["COMMUNITY_TAB_URL"], tab["tabRenderer"]["endpoint"]["commandMetadata"]["webCommandMetadata"]["url"]
+            ):
                 return tab
         raise Exception("[Could not find a Community tab in the channel response]")
 
@@ -155,3 +269,65 @@ class CommunityTab(object):
         except Exception as e:
             print("[Can't get tracking params from the tab]")
             raise e
+
+
+class AsyncCommunityTab(CommunityTab):
+    POST_CLASS = AsyncPost
+
+    def get_client(self):
+        return self.client if self.client is not None else get_default_async_client()
+
+    async def load_posts(self):
+        client = self.get_client()
+        headers = self.get_headers(client.cookies)
+
+        if self.posts_continuation_token is None:
+            self.community_url = CommunityTab.FORMAT_URLS["COMMUNITY_TAB"].format("c", self.channel_name)
+            r = await client.get(self.community_url, headers=headers)
+            if r.status_code != 200:
+                self.community_url = CommunityTab.FORMAT_URLS["COMMUNITY_TAB"].format("channel", self.channel_name)
+                r = await client.get(self.community_url, headers=headers)
+
+            if r.status_code != 200:
+                raise Exception(f"[Can't get data from the channel_name: {self.channel_name}]")
+
+            with time_stage(client, "COMMUNITY_TAB", "extract", len(r.content)):
+                data = extract_yt_initial_data(r.text)
+            with time_stage(client, "COMMUNITY_TAB", "from_data"):
+                self.load_posts_from_initial_data(data)
+        elif self.posts_continuation_token is not False:
+            headers, json_body = self.get_continuation_request(headers)
+
+            r = await client.post(CommunityTab.FORMAT_URLS["BROWSE_ENDPOINT"], json=json_body, headers=headers)
+
+            data = load_json(client, "BROWSE_ENDPOINT", r.content)
+            with time_stage(client, "BROWSE_ENDPOINT", "from_data"):
+                self.load_posts_from_continuation(data)
+
+    async def iter_posts(self, keep=True, checkpoint_store=None):
+        while self.posts_continuation_token is not False:
+            num_posts = len(self.posts)
+            await self.load_posts()
+
+            new_posts = self.posts[num_posts:]
+            if not keep:
+                del self.posts[num_posts:]
+
+            for post in new_posts:
+                yield post
+
+            if checkpoint_store is not None:
+                checkpoint_store.save(self)
+
+    async def iter_new_posts(self, seen_post_ids, keep=True, max_seen=2):
+        seen_post_ids = set(seen_post_ids)
+        num_seen = 0
+
+        async for post in self.iter_posts(keep=keep):
+            if post.post_id not in seen_post_ids:
+                num_seen = 0
+                yield post
+            else:
+                num_seen += 1
+                if num_seen >= max_seen:
+                    return
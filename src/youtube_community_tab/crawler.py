@@ -0,0 +1,128 @@
+import asyncio
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+
+from .community_tab import CommunityTab, AsyncCommunityTab
+
+
+class CommunityCrawler(object):
+    # Crawls the community tab of many channels at once, max_workers channels are paginated at the
+    # same time. crawl() yields (channel_id, post) as soon as each page is loaded, in no particular
+    # order between channels. A channel that fails is recorded in errors and doesn't stop the others.
+    # To also bound the requests to the same host, give a Client(max_per_host=...) as client.
+    # seen_post_ids maps channels to the post ids already known, those channels are synced
+    # incrementally with CommunityTab.iter_new_posts. The posts are saved in storage if given
+    COMMUNITY_TAB_CLASS = CommunityTab
+
+    def __init__(self, channels, max_workers=8, client=None, max_queued_posts=1000, seen_post_ids=None, storage=None):
+        self.channels = list(channels)
+        self.max_workers = max_workers
+        self.client = client
+        self.max_queued_posts = max_queued_posts
+        self.seen_post_ids = seen_post_ids if seen_post_ids is not None else {}
+        self.storage = storage
+
+        self.errors = {}
+        self.channel_ids = {}
+
+    def crawl(self, expire_after=None):
+        results = queue.Queue(maxsize=self.max_queued_posts)
+        stop = Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+
+        for channel in self.channels:
+            executor.submit(self.crawl_channel, channel, results, stop, expire_after)
+
+        try:
+            remaining = len(self.channels)
+
+            while remaining > 0:
+                item = results.get()
+
+                # None marks the end of a channel, with or without error
+                if item is None:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            # The consumer can stop early, the workers must not stay blocked on a full queue
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def crawl_channel(self, channel, results, stop, expire_after=None):
+        try:
+            ct = self.COMMUNITY_TAB_CLASS(channel, client=self.client, storage=self.storage)
+
+            if channel in self.seen_post_ids:
+                posts = ct.iter_new_posts(self.seen_post_ids[channel], expire_after=expire_after, keep=False)
+            else:
+                posts = ct.iter_posts(expire_after=expire_after, keep=False)
+
+            for post in posts:
+                self.channel_ids[channel] = ct.channel_id
+
+                if not self.put(results, (ct.channel_id, post), stop):
+                    return
+        except (Exception, SystemExit) as e:
+            # CommunityTab.load_posts exits when the channel doesn't exist
+            print(f"[Can't crawl the channel: {channel}]")
+            self.errors[channel] = e
+
+        self.put(results, None, stop)
+
+    @staticmethod
+    def put(results, item, stop):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+
+class AsyncCommunityCrawler(CommunityCrawler):
+    # Same as CommunityCrawler with one asyncio task per channel, max_workers of them running at once.
+    # Requests are also bounded by the max_concurrency of the AsyncClient
+    COMMUNITY_TAB_CLASS = AsyncCommunityTab
+
+    async def crawl(self):
+        results = asyncio.Queue(maxsize=self.max_queued_posts)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        tasks = [asyncio.ensure_future(self.crawl_channel(channel, results, semaphore)) for channel in self.channels]
+
+        try:
+            remaining = len(self.channels)
+
+            while remaining > 0:
+                item = await results.get()
+
+                if item is None:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def crawl_channel(self, channel, results, semaphore):
+        async with semaphore:
+            try:
+                ct = self.COMMUNITY_TAB_CLASS(channel, client=self.client, storage=self.storage)
+
+                if channel in self.seen_post_ids:
+                    posts = ct.iter_new_posts(self.seen_post_ids[channel], keep=False)
+                else:
+                    posts = ct.iter_posts(keep=False)
+
+                async for post in posts:
+                    self.channel_ids[channel] = ct.channel_id
+                    await results.put((ct.channel_id, post))
+            except Exception as e:
+                print(f"[Can't crawl the channel: {channel}]")
+                self.errors[channel] = e
+
+        await results.put(None)
@@ -0,0 +1,107 @@
+import gzip
+import os
+
+from .helpers.json_backend import json_dumps
+from .comment import Comment
+from .post import Post
+from .reply import Reply
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIONS = [None, "gzip", "zstd"]
+
+
+class JsonlExporter(object):
+    # Writes posts, comments and replies as compact JSON Lines, one record at a time, so they can be
+    # fed straight from the iter_* generators. Each record is the as_json() of the object with its
+    # "type" ("post", "comment" or "reply"). compression is None, "gzip" or "zstd" (needs zstandard).
+    # With max_bytes, a new file is started once max_bytes of JSON were written to the current one,
+    # and the files are numbered: posts.jsonl.gz -> posts-00000.jsonl.gz, posts-00001.jsonl.gz, ...
+    def __init__(self, path, compression=None, max_bytes=None):
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"[compression={compression} is not supported, use one of {COMPRESSIONS}]")
+
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("[zstd compression requires zstandard, install it with `pip install zstandard`]")
+
+        self.path = path
+        self.compression = compression
+        self.max_bytes = max_bytes
+
+        self.file = None
+        self.file_index = 0
+        self.file_bytes = 0
+        self.paths = []
+        self.num_records = 0
+
+    def get_path(self):
+        if self.max_bytes is None:
+            return self.path
+
+        directory, name = os.path.split(self.path)
+        stem, dot, extension = name.partition(".")
+
+        return os.path.join(directory, f"{stem}-{self.file_index:05d}{dot}{extension}")
+
+    def open_file(self):
+        path = self.get_path()
+        self.paths.append(path)
+
+        if self.compression == "gzip":
+            return gzip.open(path, "wt", encoding="utf-8")
+        if self.compression == "zstd":
+            return zstandard.open(path, "wt", encoding="utf-8")
+
+        return open(path, "w", encoding="utf-8")
+
+    def write(self, obj):
+        if isinstance(obj, Post):
+            record = {"type": "post", **obj.as_json()}
+        elif isinstance(obj, Comment):
+            record = {"type": "comment", **obj.as_json()}
+        elif isinstance(obj, Reply):
+            record = {"type": "reply", **obj.as_json()}
+        else:
+            record = obj
+
+        line = json_dumps(record) + "\n"
+        size = len(line) if line.isascii() else len(line.encode("utf-8"))
+
+        if self.file is not None and self.max_bytes is not None and self.file_bytes + size > self.max_bytes:
+            self.file.close()
+            self.file = None
+            self.file_index += 1
+
+        if self.file is None:
+            self.file = self.open_file()
+            self.file_bytes = 0
+
+        self.file.write(line)
+        self.file_bytes += size
+        self.num_records += 1
+
+    def write_many(self, objs):
+        for obj in objs:
+            self.write(obj)
+
+    def write_post_tree(self, post, expire_after=None):
+        # Writes the post, then each comment followed by its replies, loading them page by page
+        self.write(post)
+
+        for comment in post.iter_comments(expire_after=expire_after, keep=False):
+            self.write(comment)
+            self.write_many(comment.iter_replies(expire_after=expire_after, keep=False))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
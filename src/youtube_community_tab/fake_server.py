@@ -0,0 +1,547 @@
+import argparse
+import random
+import time
+from collections import Counter
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import urlsplit
+
+from .helpers.json_backend import json_loads, json_dumps
+from .helpers.protobuf import decode_message, decode_params
+from .rate_limiter import get_endpoint
+
+TRACKING = "CBQQ8TsiEwiX" + "a1B2c3D4e5F6" * 4
+
+STATS_PATH = "/fake/stats"
+
+
+def get_channel_id(channel_name):
+    return channel_name if channel_name.startswith("UC") else f"UC_{channel_name}"
+
+
+def get_post_id(channel_name, i):
+    return f"Ugkx_{channel_name}_{i:05d}"
+
+
+def get_channel_name(post_id):
+    # The channel a post id of get_post_id was made for
+    return post_id[5:].rpartition("_")[0] if post_id.startswith("Ugkx_") else "fake"
+
+
+def navigation_endpoint(url, browse_id):
+    return {
+        "clickTrackingParams": TRACKING,
+        "commandMetadata": {"webCommandMetadata": {"url": url, "webPageType": "WEB_PAGE_TYPE_CHANNEL", "rootVe": 3611, "apiUrl": "/youtubei/v1/browse"}},
+        "browseEndpoint": {"browseId": browse_id, "canonicalBaseUrl": url},
+    }
+
+
+def thumbnails(url, sizes=(32, 48, 76, 100, 176, 288)):
+    return {"thumbnails": [{"url": f"{url}=s{size}-c-k-c0x00ffffff-no-rj", "width": size, "height": size} for size in sizes]}
+
+
+def toggle_button(name, count):
+    return {
+        "toggleButtonRenderer": {
+            "style": {"styleType": "STYLE_TEXT"},
+            "isToggled": False,
+            "isDisabled": False,
+            "defaultIcon": {"iconType": name.upper()},
+            "defaultText": {"accessibility": {"accessibilityData": {"label": f"{count} {name}s"}}, "simpleText": str(count)},
+            "trackingParams": TRACKING,
+            "defaultTooltip": name.capitalize(),
+            "toggledTooltip": f"Remove {name}",
+            "accessibilityData": {"accessibilityData": {"label": name.capitalize()}},
+        }
+    }
+
+
+def content_text(i):
+    return {
+        "runs": [
+            {"text": f"Post number {i}, with a link "},
+            {
+                "text": "example.com",
+                "navigationEndpoint": {
+                    "clickTrackingParams": TRACKING,
+                    "commandMetadata": {
+                        "webCommandMetadata": {"url": "https://www.youtube.com/redirect?q=https%3A%2F%2Fexample.com", "webPageType": "WEB_PAGE_TYPE_UNKNOWN"}
+                    },
+                    "urlEndpoint": {"url": "https://www.youtube.com/redirect?q=https%3A%2F%2Fexample.com", "target": "TARGET_NEW_WINDOW"},
+                },
+                "loggingDirectives": {"trackingParams": TRACKING, "visibility": {"types": "12"}},
+            },
+            {"text": " and a hashtag "},
+            {
+                "text": "#benchmark",
+                "navigationEndpoint": {
+                    "clickTrackingParams": TRACKING,
+                    "commandMetadata": {"webCommandMetadata": {"url": "/hashtag/benchmark", "webPageType": "WEB_PAGE_TYPE_BROWSE", "rootVe": 83769}},
+                    "browseEndpoint": {"browseId": "FEhashtag", "params": "6gULCgliZW5jaG1hcms%3D"},
+                },
+                "loggingDirectives": {"trackingParams": TRACKING, "visibility": {"types": "12"}},
+            },
+        ]
+    }
+
+
+def attachment(i):
+    image = {"backstageImageRenderer": {"image": thumbnails(f"https://yt3.ggpht.com/image{i}", (288, 400, 640, 1080)), "trackingParams": TRACKING}}
+
+    if i % 3 == 0:
+        return image
+    if i % 3 == 1:
+        return {"postMultiImageRenderer": {"images": [image] * 3}}
+
+    return {
+        "pollRenderer": {
+            "choices": [
+                {
+                    "text": {"runs": [{"text": f"Choice {choice}"}]},
+                    "selected": False,
+                    "voteRatioIfSelected": 0.5,
+                    "votePercentageIfSelected": {"simpleText": "50%"},
+                    "voteRatioIfNotSelected": 0.4,
+                    "votePercentageIfNotSelected": {"simpleText": "40%"},
+                    "selectServiceEndpoint": {"clickTrackingParams": TRACKING, "performCommentActionEndpoint": {"action": "CAUQAhoa" * 8}},
+                    "deselectServiceEndpoint": {"clickTrackingParams": TRACKING, "performCommentActionEndpoint": {"action": "CAUQAhoa" * 8}},
+                }
+                for choice in range(4)
+            ],
+            "totalVotes": {"simpleText": "1.2K votes"},
+            "trackingParams": TRACKING,
+        }
+    }
+
+
+def post_renderer(channel_name, i):
+    url = f"/@{channel_name}"
+    channel_id = get_channel_id(channel_name)
+
+    return {
+        "backstagePostRenderer": {
+            "postId": get_post_id(channel_name, i),
+            "authorText": {"runs": [{"text": channel_name, "navigationEndpoint": navigation_endpoint(url, channel_id)}], "accessibility": {}},
+            "authorEndpoint": navigation_endpoint(url, channel_id),
+            "authorThumbnail": thumbnails(f"https://yt3.ggpht.com/ytc/{channel_name}"),
+            "contentText": content_text(i),
+            "backstageAttachment": attachment(i),
+            "expandButton": {"buttonRenderer": {"text": {"runs": [{"text": "Read more"}]}, "trackingParams": TRACKING}},
+            "actionButtons": {
+                "commentActionButtonsRenderer": {
+                    "likeButton": toggle_button("like", i),
+                    "dislikeButton": toggle_button("dislike", 0),
+                    "replyButton": {"buttonRenderer": {"text": {"simpleText": "12"}, "trackingParams": TRACKING}},
+                    "trackingParams": TRACKING,
+                }
+            },
+            "voteCount": {"accessibility": {"accessibilityData": {"label": f"{i} likes"}}, "simpleText": str(i)},
+            "voteStatus": "INDIFFERENT",
+            "publishedTimeText": {"runs": [{"text": f"{i} days ago", "navigationEndpoint": {"clickTrackingParams": TRACKING}}]},
+            "trackingParams": TRACKING,
+            "surface": "BACKSTAGE_SURFACE_TYPE_STREAM",
+        }
+    }
+
+
+def comment_renderer(comment_id, i):
+    url = f"/@author{i % 50}"
+
+    return {
+        "commentId": comment_id,
+        "authorText": {"simpleText": url[1:]},
+        "authorThumbnail": thumbnails(f"https://yt3.ggpht.com/ytc/author{i % 50}", (48, 88, 176)),
+        "authorEndpoint": navigation_endpoint(url, f"UCauthor{i % 50:016d}"),
+        "contentText": {"runs": [{"text": f"Comment number {i}, long enough to look like a real one. " * 2}]},
+        "publishedTimeText": {"runs": [{"text": "2 days ago", "navigationEndpoint": {"clickTrackingParams": TRACKING}}]},
+        "isLiked": False,
+        "actionButtons": {"commentActionButtonsRenderer": {"likeButton": toggle_button("like", i), "dislikeButton": toggle_button("dislike", 0)}},
+        "authorIsChannelOwner": i % 10 == 0,
+        "voteStatus": "INDIFFERENT",
+        "voteCount": {"accessibility": {"accessibilityData": {"label": f"{i} likes"}}, "simpleText": str(i)},
+        "trackingParams": TRACKING,
+        "loggingDirectives": {"trackingParams": TRACKING, "visibility": {"types": "12"}},
+    }
+
+
+def comment_thread(comment_id, i, replies_token=None):
+    thread = {"comment": {"commentRenderer": comment_renderer(comment_id, i)}, "trackingParams": TRACKING}
+
+    if replies_token is not None:
+        thread["replies"] = {"commentRepliesRenderer": {"contents": [continuation(replies_token)], "trackingParams": TRACKING}}
+
+    return {"commentThreadRenderer": thread}
+
+
+def continuation(token, button=False):
+    endpoint = {"clickTrackingParams": TRACKING, "commandMetadata": {"webCommandMetadata": {"sendPost": True, "apiUrl": "/youtubei/v1/browse"}}}
+    endpoint["continuationCommand"] = {"token": token, "request": "CONTINUATION_REQUEST_TYPE_BROWSE"}
+
+    if button:
+        return {"continuationItemRenderer": {"trigger": "CONTINUATION_TRIGGER_ON_ITEM_SHOWN", "button": {"buttonRenderer": {"command": endpoint}}}}
+
+    return {"continuationItemRenderer": {"trigger": "CONTINUATION_TRIGGER_ON_ITEM_SHOWN", "continuationEndpoint": endpoint}}
+
+
+def response_context():
+    return {"webResponseContextExtensionData": {"ytConfigData": {"visitorData": "CgtGYWtlWW91VHViZSiAgICA", "sessionIndex": 0}}}
+
+
+def initial_data_page(data):
+    return f'<html><head></head><body><script nonce="fake">var ytInitialData = {json_dumps(data)};</script></body></html>'
+
+
+def channel_page(channel_name, items):
+    return initial_data_page(
+        {
+            "responseContext": response_context(),
+            "contents": {
+                "twoColumnBrowseResultsRenderer": {
+                    "tabs": [
+                        {"tabRenderer": {"endpoint": {"commandMetadata": {"webCommandMetadata": {"url": f"/@{channel_name}/featured"}}}}},
+                        {
+                            "tabRenderer": {
+                                "endpoint": {"commandMetadata": {"webCommandMetadata": {"url": f"/@{channel_name}/posts"}}},
+                                "selected": True,
+                                "content": {"sectionListRenderer": {"contents": [{"itemSectionRenderer": {"contents": items}}], "trackingParams": TRACKING}},
+                            }
+                        },
+                    ]
+                }
+            },
+            "metadata": {"channelMetadataRenderer": {"title": channel_name, "externalId": get_channel_id(channel_name)}},
+        }
+    )
+
+
+def post_page(post, token):
+    return initial_data_page(
+        {
+            "responseContext": response_context(),
+            "contents": {
+                "twoColumnBrowseResultsRenderer": {
+                    "tabs": [
+                        {
+                            "tabRenderer": {
+                                "content": {
+                                    "sectionListRenderer": {
+                                        "contents": [
+                                            {"itemSectionRenderer": {"contents": [{"backstagePostThreadRenderer": {"post": post}}]}},
+                                            {"itemSectionRenderer": {"contents": [continuation(token)]}},
+                                        ]
+                                    }
+                                }
+                            }
+                        }
+                    ]
+                }
+            },
+        }
+    )
+
+
+def append_response(items):
+    return {
+        "responseContext": response_context(),
+        "trackingParams": TRACKING,
+        "onResponseReceivedEndpoints": [{"clickTrackingParams": TRACKING, "appendContinuationItemsAction": {"continuationItems": items}}],
+    }
+
+
+def reload_response(items):
+    return {
+        "responseContext": response_context(),
+        "trackingParams": TRACKING,
+        "onResponseReceivedEndpoints": [
+            {"clickTrackingParams": TRACKING, "reloadContinuationItemsCommand": {"slot": "RELOAD_CONTINUATION_SLOT_HEADER"}},
+            {"clickTrackingParams": TRACKING, "reloadContinuationItemsCommand": {"continuationItems": items}},
+        ],
+    }
+
+
+def get_fixed_comment_ids(token):
+    # The comment and post ids of a Comment.get_fixed_comment_params continuation, None for other tokens
+    try:
+        outer = decode_message(decode_params(token))
+        part1 = dict(decode_message(decode_params(dict(decode_message(outer[0][1]))[3].decode())))
+        ids = dict(decode_message(part1[25]))
+
+        return ids[16].decode(), ids[22].decode()
+    except Exception:
+        return None
+
+
+class FakeYouTubeHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so the clients reuse their connections like they do with the real site
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.respond(b"")
+
+    def do_POST(self):
+        self.respond(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+
+    def respond(self, body):
+        status_code, headers, content = self.server.fake.handle(self.command, self.path, body)
+
+        self.send_response(status_code)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeYouTubeServer(object):
+    # Local stand-in for the endpoints of the FORMAT_URLS tables, to be used with set_base_url(server.url).
+    # Every channel name exists and has num_pages pages of posts_per_page posts, every post has num_pages
+    # pages of comments_per_page comments, every other comment has num_pages pages of replies_per_page replies.
+    # Each request waits latency seconds. Browse requests and pages get a 500 with probability error_rate,
+    # a 429 (with a Retry-After of retry_after seconds) with probability throttle_rate, and browse requests
+    # get a 200 with a truncated body with probability incomplete_rate. requests counts the requests
+    # per endpoint, status_codes the responses, max_in_flight the most requests handled at once, they are
+    # also served as JSON at STATS_PATH. For load tests, run it in its own process:
+    # python -m youtube_community_tab.fake_server --port 8000
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        num_pages=3,
+        posts_per_page=10,
+        comments_per_page=20,
+        replies_per_page=10,
+        latency=0,
+        error_rate=0,
+        throttle_rate=0,
+        incomplete_rate=0,
+        retry_after=0,
+        seed=None,
+    ):
+        self.host = host
+        self.port = port
+        self.num_pages = num_pages
+        self.posts_per_page = posts_per_page
+        self.comments_per_page = comments_per_page
+        self.replies_per_page = replies_per_page
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.incomplete_rate = incomplete_rate
+        self.retry_after = retry_after
+
+        self.random = random.Random(seed)
+        self.lock = Lock()
+        self.server = None
+        self.thread = None
+
+        self.requests = Counter()
+        self.status_codes = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        # The pages are the same for every request, they are built once
+        self.get_page = lru_cache(maxsize=4096)(self.build_page)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), FakeYouTubeHandler)
+        self.server.daemon_threads = True
+        self.server.fake = self
+        self.port = self.server.server_port
+
+        self.thread = Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        return self
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def reset_stats(self):
+        with self.lock:
+            self.requests.clear()
+            self.status_codes.clear()
+            self.max_in_flight = self.in_flight
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "requests": {str(endpoint): count for endpoint, count in self.requests.items()},
+                "status_codes": {str(status_code): count for status_code, count in self.status_codes.items()},
+                "max_in_flight": self.max_in_flight,
+            }
+
+    def handle(self, method, path, body):
+        if path == STATS_PATH:
+            # Not counted, so a load test running the server in another process can read the stats
+            return 200, {"Content-Type": "application/json"}, json_dumps(self.get_stats()).encode()
+
+        endpoint = get_endpoint(path)
+
+        with self.lock:
+            self.requests[endpoint] += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            draw = self.random.random()
+
+        try:
+            if self.latency > 0:
+                time.sleep(self.latency)
+
+            status_code, headers, content = self.get_response(method, path, body, endpoint, draw)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+        with self.lock:
+            self.status_codes[status_code] += 1
+
+        return status_code, headers, content
+
+    def get_response(self, method, path, body, endpoint, draw):
+        if endpoint in ["BROWSE_ENDPOINT", "COMMUNITY_TAB", "POST"]:
+            # One draw decides the injected failure: [error | throttle | incomplete | normal]
+            if draw < self.error_rate:
+                return 500, {}, b""
+            if draw < self.error_rate + self.throttle_rate:
+                return 429, {"Retry-After": str(self.retry_after)}, b""
+            if endpoint == "BROWSE_ENDPOINT" and draw < self.error_rate + self.throttle_rate + self.incomplete_rate:
+                # Cut short, like the truncated bodies of a throttled browse
+                return 200, {"Content-Type": "application/json"}, json_dumps({"responseContext": response_context()}).encode()[:-1]
+
+        data = json_loads(body) if body else {}
+        path = urlsplit(path).path
+
+        if method == "GET" and endpoint == "COMMUNITY_TAB":
+            parts = path.strip("/").split("/")
+            if len(parts) != 3 or parts[0] not in ["c", "channel"]:
+                return 404, {}, b""
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, self.get_page("posts", parts[1], 0)
+        if method == "GET" and endpoint == "POST":
+            return 200, {"Content-Type": "text/html; charset=utf-8"}, self.get_page("post", path.rpartition("/")[2], 0)
+        if method == "POST" and endpoint == "BROWSE_ENDPOINT":
+            kind, _, rest = data.get("continuation", "").partition(":")
+            object_id, _, page = rest.rpartition(":")
+
+            if kind in ["posts", "comments", "replies"] and page.isdigit():
+                return 200, {"Content-Type": "application/json"}, self.get_page(kind, object_id, int(page))
+
+            ids = get_fixed_comment_ids(data.get("continuation", ""))
+            if ids is not None:
+                return 200, {"Content-Type": "application/json"}, self.get_page("comment", *ids)
+
+            return 400, {}, b""
+        if method == "POST" and endpoint == "PERFORM_COMMENT_ACTION_ENDPOINT":
+            results = [{"status": "STATUS_SUCCEEDED", "feedback": "FEEDBACK_LIKE"} for _ in data.get("actions", [])]
+            return 200, {"Content-Type": "application/json"}, json_dumps({"responseContext": {}, "actionResults": results}).encode()
+        if method == "POST" and endpoint == "CREATE_COMMENT_ENDPOINT":
+            thread = comment_thread(f"Ugw_created_{self.random.randrange(10**9):09d}", 0)
+            response = {"actions": [{"createCommentAction": {"contents": thread}}], "actionResult": {"status": "STATUS_SUCCEEDED"}}
+            return 200, {"Content-Type": "application/json"}, json_dumps(response).encode()
+        if method == "POST" and endpoint == "UPDATE_COMMENT_ENDPOINT":
+            return 200, {"Content-Type": "application/json"}, json_dumps({"actionResult": {"status": "STATUS_SUCCEEDED"}}).encode()
+
+        return 404, {}, b""
+
+    def get_next_token(self, kind, object_id, page):
+        return f"{kind}:{object_id}:{page + 1}" if page + 1 < self.num_pages else None
+
+    def build_page(self, kind, object_id, page):
+        if kind == "posts":
+            first = page * self.posts_per_page
+            items = [{"backstagePostThreadRenderer": {"post": post_renderer(object_id, first + i)}} for i in range(self.posts_per_page)]
+            next_token = self.get_next_token(kind, object_id, page)
+            items += [continuation(next_token)] if next_token is not None else []
+
+            return channel_page(object_id, items).encode() if page == 0 else json_dumps(append_response(items)).encode()
+
+        if kind == "post":
+            index = object_id.rpartition("_")[2]
+            post = post_renderer(get_channel_name(object_id), int(index) if index.isdigit() else 0)
+            post["backstagePostRenderer"]["postId"] = object_id
+
+            return post_page(post, f"comments:{object_id}:0").encode()
+
+        if kind == "comments":
+            first = page * self.comments_per_page
+            items = []
+            for i in range(first, first + self.comments_per_page):
+                comment_id = f"Ugw_{object_id}_{i:05d}"
+                items.append(comment_thread(comment_id, i, replies_token=f"replies:{comment_id}:0" if i % 2 == 0 else None))
+            next_token = self.get_next_token(kind, object_id, page)
+            items += [continuation(next_token)] if next_token is not None else []
+
+            return json_dumps(reload_response(items) if page == 0 else append_response(items)).encode()
+
+        if kind == "replies":
+            first = page * self.replies_per_page
+            items = [{"commentRenderer": comment_renderer(f"{object_id}.{i:05d}", i)} for i in range(first, first + self.replies_per_page)]
+            next_token = self.get_next_token(kind, object_id, page)
+            items += [continuation(next_token, button=True)] if next_token is not None else []
+
+            return json_dumps(append_response(items)).encode()
+
+        if kind == "comment":
+            # Comment.from_ids, object_id is the comment id and page the post id
+            return json_dumps(reload_response([comment_thread(object_id, 0, replies_token=f"replies:{object_id}:0")])).encode()
+
+        raise ValueError(f"[kind={kind} is not supported]")
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Serves a fake YouTube for the CommunityTab, Post and Comment endpoints, see set_base_url")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--posts-per-page", type=int, default=10)
+    parser.add_argument("--comments-per-page", type=int, default=20)
+    parser.add_argument("--replies-per-page", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--throttle-rate", type=float, default=0)
+    parser.add_argument("--incomplete-rate", type=float, default=0)
+    parser.add_argument("--retry-after", type=float, default=0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(args)
+
+    server = FakeYouTubeServer(
+        host=args.host,
+        port=args.port,
+        num_pages=args.pages,
+        posts_per_page=args.posts_per_page,
+        comments_per_page=args.comments_per_page,
+        replies_per_page=args.replies_per_page,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        incomplete_rate=args.incomplete_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    ).start()
+
+    print(f"[Serving a fake YouTube at {server.url}]", flush=True)
+
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
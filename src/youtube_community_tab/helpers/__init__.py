@@ -3,9 +3,26 @@ from .utils import (
     save_object_to_file,
     safely_pop_value_from_key,
     search_key,
+    iter_search_key,
+    find_key,
     get_auth_header,
+    extract_yt_initial_data,
+    get_keep_raw,
+    set_keep_raw,
+    intern_strings,
     CLIENT_VERSION,
 )
+from .json_backend import (
+    json_loads,
+    json_dumps,
+    get_json_backend,
+    set_json_backend,
+)
+from .protobuf import (
+    encode_varint,
+    encode_message,
+    encode_params,
+)
 from .clean_items import (
     clean_content_text,
     clean_backstage_attachment,
@@ -16,8 +33,21 @@ __all__ = [
     "safely_pop_value_from_key",
     "save_object_to_file",
     "search_key",
+    "iter_search_key",
+    "find_key",
     "get_auth_header",
+    "extract_yt_initial_data",
+    "get_keep_raw",
+    "set_keep_raw",
+    "intern_strings",
     "clean_content_text",
     "clean_backstage_attachment",
+    "json_loads",
+    "json_dumps",
+    "get_json_backend",
+    "set_json_backend",
+    "encode_varint",
+    "encode_message",
+    "encode_params",
     "CLIENT_VERSION",
 ]
@@ -1,77 +1,145 @@
 from urllib.parse import parse_qs, unquote, urlparse
 from .utils import safely_get_value_from_key as safe
-from .utils import safely_pop_value_from_key as safe_pop
+
+POLL_CHOICE_KEYS = [
+    "selectServiceEndpoint",
+    "deselectServiceEndpoint",
+    "voteRatioIfSelected",
+    "votePercentageIfSelected",
+    "voteRatioIfNotSelected",
+    "votePercentageIfNotSelected",
+]
+
+VIDEO_KEYS = [
+    "publishedTimeText",
+    "navigationEndpoint",
+    "trackingParams",
+    "showActionMenu",
+    "menu",
+    "channelThumbnailSupportedRenderers",
+    "thumbnailOverlays",
+]
+
+AUTHOR_ENDPOINT_KEYS = ["clickTrackingParams", "commandMetadata", "browseEndpoint"]
 
 
 # lots of returned objects are full of tracking params, client data, duplicate info, etc. this sorta trims the fat.
+# The functions return trimmed copies, the objects they are given aren't modified
+def without(obj, keys):
+    return {key: value for key, value in obj.items() if key not in keys}
+
+
 def clean_content_text(content):
-    for item in safe(content, "runs", default=[]):
-        if "navigationEndpoint" in item:
-            # traditional links
-            if "urlEndpoint" in item["navigationEndpoint"]:
-                url = item["navigationEndpoint"]["urlEndpoint"]["url"]
-                # replace redirects with direct links
-                if url.startswith("https://www.youtube.com/redirect"):
-                    parsed_url = urlparse(url)
-                    redirect_url = parse_qs(parsed_url.query)["q"][0]
-                    url = unquote(redirect_url)
-                item["urlEndpoint"] = {"url": url}
-                item.pop("navigationEndpoint")
-            # hashtags
-            elif "browseEndpoint" in item["navigationEndpoint"]:
-                item.pop("loggingDirectives")
-                safe_pop(item, "navigationEndpoint", "browseEndpoint", "params")
-                item["browseEndpoint"] = item["navigationEndpoint"]["browseEndpoint"]
-                item["browseEndpoint"]["url"] = item["navigationEndpoint"]["commandMetadata"]["webCommandMetadata"]["url"]
-                item.pop("navigationEndpoint")
-    return content
+    runs = safe(content, "runs")
+    if not runs:
+        return content
+
+    return {**content, "runs": [clean_run(item) for item in runs]}
+
+
+def clean_run(item):
+    if "navigationEndpoint" not in item:
+        return item
+
+    navigation_endpoint = item["navigationEndpoint"]
+
+    # traditional links
+    if "urlEndpoint" in navigation_endpoint:
+        url = navigation_endpoint["urlEndpoint"]["url"]
+        # replace redirects with direct links
+        if url.startswith("https://www.youtube.com/redirect"):
+            parsed_url = urlparse(url)
+            redirect_url = parse_qs(parsed_url.query)["q"][0]
+            url = unquote(redirect_url)
+
+        item = without(item, ["navigationEndpoint"])
+        item["urlEndpoint"] = {"url": url}
+    # hashtags
+    elif "browseEndpoint" in navigation_endpoint:
+        item = without(item, ["loggingDirectives", "navigationEndpoint"])
+        item["browseEndpoint"] = without(navigation_endpoint["browseEndpoint"], ["params"])
+        item["browseEndpoint"]["url"] = navigation_endpoint["commandMetadata"]["webCommandMetadata"]["url"]
+
+    return item
 
 
 def clean_backstage_attachment(attachment):
-    if attachment:
-        if "pollRenderer" in attachment:
-            for choice in attachment["pollRenderer"]["choices"]:
-                for value in [
-                    "selectServiceEndpoint",
-                    "deselectServiceEndpoint",
-                    "voteRatioIfSelected",
-                    "votePercentageIfSelected",
-                    "voteRatioIfNotSelected",
-                    "votePercentageIfNotSelected",
-                ]:
-                    safe_pop(choice, value)
-        elif "videoRenderer" in attachment:
-            safe_pop(attachment, "videoRenderer", "navigationEndpoint", "watchEndpoint", "watchEndpointSupportedOnesieConfig")
-            attachment["videoRenderer"]["watchEndpoint"] = safe(attachment, "videoRenderer", "navigationEndpoint", "watchEndpoint", default={})
-            attachment["videoRenderer"]["watchEndpoint"]["url"] = safe(
-                attachment, "videoRenderer", "navigationEndpoint", "commandMetadata", "webCommandMetadata", "url"
-            )
-
-            for long_by_line in safe(attachment, "videoRenderer", "longBylineText", "runs", default=[]):
-                long_by_line["browseEndpoint"] = long_by_line["navigationEndpoint"]["browseEndpoint"]
-                long_by_line.pop("navigationEndpoint")
-
-            for short_by_line in safe(attachment, "videoRenderer", "shortBylineText", "runs", default=[]):
-                short_by_line["browseEndpoint"] = short_by_line["navigationEndpoint"]["browseEndpoint"]
-                short_by_line.pop("navigationEndpoint")
-
-            for author in safe(attachment, "videoRenderer", "ownerText", "runs", default=[]):
-                author["browseEndpoint"] = author["navigationEndpoint"]["browseEndpoint"]
-
-            for value in [
-                "publishedTimeText",
-                "navigationEndpoint",
-                "trackingParams",
-                "showActionMenu",
-                "menu",
-                "channelThumbnailSupportedRenderers",
-                "thumbnailOverlays",
-            ]:
-                safe_pop(attachment, "videoRenderer", value)
-        elif "backstageImageRenderer" in attachment:
-            safe_pop(attachment, "backstageImageRenderer", "trackingParams")
-        elif "postMultiImageRenderer" in attachment:
-            for image in attachment["postMultiImageRenderer"]["images"]:
-                safe_pop(image, "backstageImageRenderer", "trackingParams")
-        return attachment
-    return None
+    if not attachment:
+        return None
+
+    if "pollRenderer" in attachment:
+        poll = attachment["pollRenderer"]
+        return {**attachment, "pollRenderer": {**poll, "choices": [without(choice, POLL_CHOICE_KEYS) for choice in poll["choices"]]}}
+    elif "videoRenderer" in attachment:
+        return {**attachment, "videoRenderer": clean_video(attachment["videoRenderer"])}
+    elif "backstageImageRenderer" in attachment:
+        return {**attachment, "backstageImageRenderer": without(attachment["backstageImageRenderer"], ["trackingParams"])}
+    elif "postMultiImageRenderer" in attachment:
+        multi_image = attachment["postMultiImageRenderer"]
+        return {**attachment, "postMultiImageRenderer": {**multi_image, "images": [clean_image(image) for image in multi_image["images"]]}}
+
+    return attachment
+
+
+def clean_image(image):
+    if "backstageImageRenderer" not in image:
+        return image
+
+    return {**image, "backstageImageRenderer": without(image["backstageImageRenderer"], ["trackingParams"])}
+
+
+def clean_video(video):
+    cleaned = without(video, VIDEO_KEYS)
+
+    for key in ["longBylineText", "shortBylineText"]:
+        if safe(video, key, "runs"):
+            cleaned[key] = {**video[key], "runs": [move_browse_endpoint(run) for run in video[key]["runs"]]}
+
+    # The owner keeps its navigationEndpoint
+    if safe(video, "ownerText", "runs"):
+        cleaned["ownerText"] = {
+            **video["ownerText"],
+            "runs": [{**run, "browseEndpoint": run["navigationEndpoint"]["browseEndpoint"]} for run in video["ownerText"]["runs"]],
+        }
+
+    cleaned["watchEndpoint"] = without(safe(video, "navigationEndpoint", "watchEndpoint", default={}), ["watchEndpointSupportedOnesieConfig"])
+    cleaned["watchEndpoint"]["url"] = safe(video, "navigationEndpoint", "commandMetadata", "webCommandMetadata", "url")
+
+    return cleaned
+
+
+def move_browse_endpoint(run):
+    cleaned = without(run, ["navigationEndpoint"])
+    cleaned["browseEndpoint"] = run["navigationEndpoint"]["browseEndpoint"]
+
+    return cleaned
+
+
+def clean_author_text(author_text):
+    # The runs of the author of a post link to the channel with a browseEndpoint, like the hashtags
+    runs = safe(author_text, "runs")
+    if not runs:
+        return author_text
+
+    return {**author_text, "runs": [clean_author_run(run) for run in runs]}
+
+
+def clean_author_run(run):
+    cleaned = without(run, ["navigationEndpoint"])
+    cleaned["browseEndpoint"] = {
+        **run["navigationEndpoint"]["browseEndpoint"],
+        "url": run["navigationEndpoint"]["commandMetadata"]["webCommandMetadata"]["url"],
+    }
+
+    return cleaned
+
+
+def clean_author_endpoint(endpoint):
+    if endpoint is None:
+        return None
+
+    cleaned = without(endpoint, AUTHOR_ENDPOINT_KEYS)
+    cleaned["browseId"] = endpoint["browseEndpoint"]["browseId"]
+    cleaned["url"] = endpoint["commandMetadata"]["webCommandMetadata"]["url"]
+
+    return cleaned
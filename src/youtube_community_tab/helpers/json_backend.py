@@ -0,0 +1,69 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+JSON_BACKENDS = {
+    "orjson": orjson,
+    "ujson": ujson,
+    "json": json,
+}
+
+# The fastest installed backend is used by default, the stdlib is always available
+json_backend = "orjson" if orjson is not None else "ujson" if ujson is not None else "json"
+
+
+def get_json_backend():
+    return json_backend
+
+
+def set_json_backend(name):
+    global json_backend
+
+    if name not in JSON_BACKENDS:
+        raise KeyError(f"[Unknown JSON backend: {name}]")
+
+    if JSON_BACKENDS[name] is None:
+        raise ImportError(f"[The JSON backend {name} is not installed]")
+
+    json_backend = name
+
+
+def serialize_default(obj):
+    # Shared posts keep the original Post object in as_json()
+    if hasattr(obj, "as_json"):
+        return obj.as_json()
+
+    raise TypeError(f"[Object of type {type(obj).__name__} is not JSON serializable]")
+
+
+def json_loads(data):
+    # data can be str or bytes (response.content avoids decoding the body twice)
+    if json_backend == "orjson":
+        return orjson.loads(data)
+    if json_backend == "ujson":
+        return ujson.loads(data)
+
+    return json.loads(data)
+
+
+def json_dumps(obj, indent=False):
+    # indent=True is the output of str(post) and save_object_to_file, always the stdlib one with
+    # 4 spaces, whatever the backend. The compact output doesn't escape the non-ASCII characters (like
+    # orjson, which writes UTF-8 only), the same text on every backend
+    if indent:
+        return json.dumps(obj, default=serialize_default, indent=4)
+
+    if json_backend == "orjson":
+        return orjson.dumps(obj, default=serialize_default).decode()
+    if json_backend == "ujson":
+        return ujson.dumps(obj, default=serialize_default, ensure_ascii=False, escape_forward_slashes=False)
+
+    return json.dumps(obj, default=serialize_default, separators=(",", ":"), ensure_ascii=False)
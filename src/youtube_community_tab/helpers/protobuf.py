@@ -0,0 +1,80 @@
+from base64 import urlsafe_b64encode, urlsafe_b64decode
+
+# Wire types of the protobuf encoding
+VARINT = 0
+LEN = 2
+
+
+def encode_varint(value):
+    out = bytearray()
+
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+
+    out.append(value)
+
+    return bytes(out)
+
+
+def encode_field(field_number, value):
+    # int and bool are varints, str and bytes are length-delimited,
+    # a list of (field_number, value) is a nested message
+    if isinstance(value, (bool, int)):
+        return encode_varint(field_number << 3 | VARINT) + encode_varint(int(value))
+
+    if isinstance(value, str):
+        value = value.encode()
+    elif isinstance(value, list):
+        value = encode_message(value)
+
+    return encode_varint(field_number << 3 | LEN) + encode_varint(len(value)) + value
+
+
+def encode_message(fields):
+    # fields = [(field_number, value), ...], encoded in that order
+    return b"".join([encode_field(field_number, value) for field_number, value in fields])
+
+
+def encode_params(*messages):
+    # The params of the youtubei requests: the concatenated messages in base64, with "=" escaped
+    return urlsafe_b64encode(b"".join(messages)).decode().replace("=", "%3D")
+
+
+def decode_varint(data, position=0):
+    value = shift = 0
+
+    while True:
+        byte = data[position]
+        value |= (byte & 0x7F) << shift
+        position += 1
+        shift += 7
+
+        if byte < 0x80:
+            return value, position
+
+
+def decode_message(data):
+    # The reverse of encode_message, nested messages are left as bytes: [(field_number, int or bytes), ...]
+    fields = []
+    position = 0
+
+    while position < len(data):
+        key, position = decode_varint(data, position)
+
+        if key & 7 == VARINT:
+            value, position = decode_varint(data, position)
+        elif key & 7 == LEN:
+            length, position = decode_varint(data, position)
+            value = data[position : position + length]
+            position += length
+        else:
+            raise ValueError(f"[wire_type={key & 7} is not supported]")
+
+        fields.append((key >> 3, value))
+
+    return fields
+
+
+def decode_params(params):
+    return urlsafe_b64decode(params.replace("%3D", "="))
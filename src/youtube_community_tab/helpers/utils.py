@@ -1,9 +1,19 @@
 import json
+import sys
 import time
 from hashlib import sha1
+from .json_backend import json_dumps, json_loads, get_json_backend
 
 CLIENT_VERSION = "2.20220311.01.00"
 
+YT_INITIAL_DATA_MARKER = "ytInitialData = "
+YT_INITIAL_DATA_END = ";</script>"
+
+json_decoder = json.JSONDecoder()
+
+# Default for the keep_raw argument of the from_data methods
+keep_raw = True
+
 
 def safely_get_value_from_key(*args, default=None):
     obj = args[0]
@@ -34,29 +44,106 @@ def safely_pop_value_from_key(*args):
         obj.pop(pop_key)
 
 
+def get_keep_raw(value=None):
+    return keep_raw if value is None else value
+
+
+def set_keep_raw(value):
+    # With keep_raw=False the models don't retain the renderer they were parsed from in raw_data
+    global keep_raw
+    keep_raw = value
+
+
+def intern_strings(obj):
+    # Returns a copy of obj with every string interned, so the values repeated across many
+    # objects (channel ids, author names, urls and thumbnails) are stored only once. The data
+    # comes from json, so comparing the exact types is enough and cheaper than isinstance
+    cls = type(obj)
+    if cls is str:
+        return sys.intern(obj)
+    if cls is dict:
+        return {sys.intern(k): intern_strings(v) for k, v in obj.items()}
+    if cls is list:
+        return [intern_strings(v) for v in obj]
+
+    return obj
+
+
+def iter_search_key(key, data, max_depth=None, with_path=True):
+    # Lazily yields (path, value) for every occurrence of key in data, depth first and in order,
+    # or only the values with with_path=False. The value of a match isn't searched further.
+    # max_depth is the longest path yielded: 1 only looks at the keys of data itself, 0 yields
+    # nothing. The walk uses a stack of iterators, and a path is only copied when a match is yielded
+    if max_depth is not None and max_depth < 1:
+        return
+
+    path = []
+    stack = [iter(((None, data),))]
+
+    while stack:
+        for k, node in stack[-1]:
+            if k == key:
+                continue
+
+            node_type = type(node)
+            if node_type is dict:
+                if key in node:
+                    yield (path[1:] + [k, key] if path else [key], node[key]) if with_path else node[key]
+                children = iter(node.items())
+            elif node_type is list:
+                if type(key) is int and 0 <= key < len(node):
+                    yield (path[1:] + [k, key] if path else [key], node[key]) if with_path else node[key]
+                children = enumerate(node)
+            else:
+                continue
+
+            if max_depth is None or len(stack) < max_depth:
+                path.append(k)
+                stack.append(children)
+                break
+        else:
+            stack.pop()
+            if path:
+                path.pop()
+
+
+def find_key(key, data, default=None, max_depth=None):
+    # Value of the first occurrence of key in data, the search stops there
+    return next(iter_search_key(key, data, max_depth=max_depth, with_path=False), default)
+
+
 def search_key(key, data, current_key=[]):
-    found = []
+    return [(current_key + path, value) for path, value in iter_search_key(key, data)]
+
+
+def extract_yt_initial_data(html):
+    # raw_decode stops right after the closing brace of the object, so the page
+    # is scanned once instead of backtracking over it like the old regex did
+    start = html.find(YT_INITIAL_DATA_MARKER)
+    if start != -1:
+        start = html.find("{", start + len(YT_INITIAL_DATA_MARKER))
 
-    if type(data).__name__ == "dict":
-        keys = list(data.keys())
-    elif type(data).__name__ == "list":
-        keys = list(range(len(data)))
-    else:
-        return []
+    if start == -1:
+        raise IndexError("[Can't find ytInitialData in the page]")
 
-    if key in keys:
-        found.append((current_key + [key], data[key]))
-        keys.remove(key)
+    # The fast backends have no raw_decode, but the object always ends right before the
+    # closing script tag, so that slice is tried first
+    if get_json_backend() != "json":
+        end = html.find(YT_INITIAL_DATA_END, start)
+        if end != -1:
+            try:
+                return json_loads(html[start:end])
+            except ValueError:
+                pass
 
-    for k in keys:
-        found += search_key(key, data[k], current_key=current_key + [k])
+    data, _ = json_decoder.raw_decode(html, start)
 
-    return found
+    return data
 
 
 def save_object_to_file(obj, path):
-    with open(path, "w") as f:
-        f.write(json.dumps(obj, indent=4))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(json_dumps(obj, indent=True))
 
 
 def get_auth_header(sapisid):
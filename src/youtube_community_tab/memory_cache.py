@@ -0,0 +1,136 @@
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from threading import Lock
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests_cache import DO_NOT_CACHE, EXPIRE_IMMEDIATELY, NEVER_EXPIRE, get_expiration_datetime
+
+from .helpers.json_backend import json_loads
+
+
+def get_ttl(expire_after):
+    # None means the entry never expires, 0 or less means it must not be kept
+    if expire_after is None or expire_after == NEVER_EXPIRE:
+        return None
+    if expire_after == DO_NOT_CACHE or expire_after == EXPIRE_IMMEDIATELY:
+        return 0
+    if isinstance(expire_after, timedelta):
+        return expire_after.total_seconds()
+    if isinstance(expire_after, datetime):
+        # Seconds left until it, read like requests_cache does (a naive datetime is local time)
+        return max(0.0, (get_expiration_datetime(expire_after) - datetime.now(timezone.utc)).total_seconds())
+
+    return float(expire_after)
+
+
+def get_max_age(expire_after):
+    # How old an entry can be to be returned for expire_after, None for any age. A datetime is an
+    # absolute expiration, so the entries are returned until then, like they would be stored
+    ttl = get_ttl(expire_after)
+    if ttl != 0 and isinstance(expire_after, datetime):
+        return None
+
+    return ttl
+
+
+class MemoryResponse(Response):
+    # A requests.Response rebuilt from a memory cache entry, so it can be used like the
+    # responses of the session (headers, request, raise_for_status, ...)
+    from_cache = True
+
+    def __init__(self, url, status_code, text, headers=None, request=None):
+        super().__init__()
+        self.url = url
+        self.status_code = status_code
+        self._content = text.encode()
+        self.encoding = "utf-8"
+        self.headers = CaseInsensitiveDict(headers)
+        self.request = request
+
+    def json(self):
+        return json_loads(self.text)
+
+
+class MemoryCache(object):
+    # Bounded LRU of response bodies kept in front of the persistent cache. It is limited both
+    # by the number of entries and by the total size of the bodies (in characters)
+    def __init__(self, max_entries=256, max_size=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_size = max_size
+
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, expire_after=None):
+        max_age = get_max_age(expire_after)
+        if max_age == 0:
+            return None
+
+        now = time.monotonic()
+
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            url, status_code, text, created, expires, headers, request = entry
+
+            # The entry must be fresh for both the expire_after it was stored with and the current one
+            if (expires is not None and now >= expires) or (max_age is not None and now - created >= max_age):
+                self.remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+
+        return MemoryResponse(url, status_code, text, headers=headers, request=request)
+
+    def set(self, key, response, expire_after=None):
+        ttl = get_ttl(expire_after)
+        if ttl == 0 or response.status_code != 200 or len(response.text) > self.max_size:
+            return
+
+        now = time.monotonic()
+        expires = now + ttl if ttl is not None else None
+
+        with self.lock:
+            if key in self.entries:
+                self.remove(key)
+
+            self.entries[key] = (response.url, response.status_code, response.text, now, expires, response.headers, response.request)
+            self.size += len(response.text)
+
+            while len(self.entries) > self.max_entries or self.size > self.max_size:
+                self.remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def remove(self, key):
+        entry = self.entries.pop(key)
+        self.size -= len(entry[2])
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "size": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
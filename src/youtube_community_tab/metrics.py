@@ -0,0 +1,156 @@
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from threading import Lock
+
+from .helpers.json_backend import json_loads
+
+# Stages timed for each endpoint:
+#   request       Client.request, from the cache lookup to the last retry (labelled with cache hit or miss)
+#   cache_lookup  lookup of the memory cache, and of the backend when it answers the request
+#   network       each attempt sent by the transport, including reading the body
+#   extract       finding and parsing ytInitialData in a page
+#   json_loads    parsing a youtubei response
+#   from_data     building the models from the parsed data
+STAGES = ["request", "cache_lookup", "network", "extract", "json_loads", "from_data"]
+
+# Upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10]
+
+NULL_TIMER = nullcontext()
+
+
+class Timer(object):
+    # Context manager observing the time spent in its block
+    __slots__ = ["metrics", "endpoint", "stage", "num_bytes", "cache", "start"]
+
+    def __init__(self, metrics, endpoint, stage, num_bytes=0, cache=None):
+        self.metrics = metrics
+        self.endpoint = endpoint
+        self.stage = stage
+        self.num_bytes = num_bytes
+        self.cache = cache
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        self.metrics.observe(self.endpoint, self.stage, time.perf_counter() - self.start, self.num_bytes, self.cache)
+
+
+class MetricsRegistry(object):
+    # Counts, bytes and latency histograms per endpoint (the names of requests_handler.CACHE_POLICY)
+    # and stage, with the cache hit/miss flag when there is one. Give it to a Client
+    # (Client(metrics=MetricsRegistry())) to instrument every request made with that client.
+    # Hooks are called with (endpoint, stage, seconds, num_bytes, cache) after each observation
+    def __init__(self, buckets=None):
+        self.buckets = sorted(buckets) if buckets is not None else DEFAULT_BUCKETS
+        self.hooks = []
+        self.lock = Lock()
+
+        # (endpoint, stage, cache) -> [count, seconds, bytes, [count of each bucket and of +Inf]]
+        self.series = {}
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook):
+        self.hooks.remove(hook)
+
+    def observe(self, endpoint, stage, seconds, num_bytes=0, cache=None):
+        key = (endpoint or "OTHER", stage, cache)
+        bucket = bisect_left(self.buckets, seconds)
+
+        with self.lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0, 0.0, 0, [0] * (len(self.buckets) + 1)]
+
+            series[0] += 1
+            series[1] += seconds
+            series[2] += num_bytes
+            series[3][bucket] += 1
+
+        for hook in self.hooks:
+            hook(key[0], stage, seconds, num_bytes, cache)
+
+    def time(self, endpoint, stage, num_bytes=0, cache=None):
+        return Timer(self, endpoint, stage, num_bytes, cache)
+
+    def reset(self):
+        with self.lock:
+            self.series = {}
+
+    def get_stats(self):
+        # {"ENDPOINT": {"stage": {"count": ..., "seconds": ..., "bytes": ..., "hits": ..., "misses": ...}}}
+        stats = {}
+
+        with self.lock:
+            for (endpoint, stage, cache), (count, seconds, num_bytes, _) in self.series.items():
+                stage_stats = stats.setdefault(endpoint, {}).setdefault(stage, {"count": 0, "seconds": 0.0, "bytes": 0, "hits": 0, "misses": 0})
+                stage_stats["count"] += count
+                stage_stats["seconds"] += seconds
+                stage_stats["bytes"] += num_bytes
+
+                if cache is not None:
+                    stage_stats["hits" if cache else "misses"] += count
+
+        return stats
+
+    def to_prometheus(self, prefix="youtube_community_tab"):
+        # Prometheus text exposition format, e.g. served on /metrics or written for the node exporter
+        with self.lock:
+            series = [(key, [count, seconds, num_bytes, list(buckets)]) for key, (count, seconds, num_bytes, buckets) in self.series.items()]
+
+        series.sort(key=lambda item: str(item[0]))
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per endpoint and stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+
+        for key, (count, seconds, _, buckets) in series:
+            labels = get_labels(*key)
+            cumulative = 0
+
+            for bound, bucket_count in zip(self.buckets + ["+Inf"], buckets):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f'{prefix}_stage_seconds_bucket{{{labels},le="{le}"}} {cumulative}')
+
+            lines.append(f"{prefix}_stage_seconds_sum{{{labels}}} {seconds!r}")
+            lines.append(f"{prefix}_stage_seconds_count{{{labels}}} {count}")
+
+        lines.append(f"# HELP {prefix}_stage_bytes_total Bytes handled per endpoint and stage.")
+        lines.append(f"# TYPE {prefix}_stage_bytes_total counter")
+
+        for key, (_, _, num_bytes, _) in series:
+            lines.append(f"{prefix}_stage_bytes_total{{{get_labels(*key)}}} {num_bytes}")
+
+        return "\n".join(lines) + "\n"
+
+
+def get_labels(endpoint, stage, cache):
+    labels = f'endpoint="{endpoint}",stage="{stage}"'
+
+    if cache is not None:
+        labels += f',cache="{"hit" if cache else "miss"}"'
+
+    return labels
+
+
+def time_stage(client, endpoint, stage, num_bytes=0, cache=None):
+    # Timer of the metrics of client, or a no-op when the client has none
+    metrics = getattr(client, "metrics", None)
+
+    if metrics is None:
+        return NULL_TIMER
+
+    return metrics.time(endpoint, stage, num_bytes, cache)
+
+
+def load_json(client, endpoint, content):
+    # json_loads of a youtubei response, timed in the metrics of client
+    with time_stage(client, endpoint, "json_loads", len(content)):
+        return json_loads(content)
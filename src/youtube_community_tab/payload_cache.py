@@ -0,0 +1,79 @@
+import sqlite3
+import time
+from threading import Lock
+
+from .helpers.json_backend import json_loads, json_dumps
+from .memory_cache import get_max_age, get_ttl
+
+
+class PayloadCache(object):
+    # Persistent cache of the parts of ytInitialData the models use, keyed by page URL.
+    # The pages themselves are then fetched around the HTTP cache, which keeps it small.
+    # path=None keeps the payloads in memory only
+    def __init__(self, path=None):
+        self.path = path
+        self.lock = Lock()
+
+        self.connection = None
+        self.payloads = {}
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            self.connection.execute("CREATE TABLE IF NOT EXISTS payloads (key TEXT PRIMARY KEY, payload TEXT, created REAL, expires REAL)")
+            self.connection.commit()
+
+        return self.connection
+
+    def get(self, key, expire_after=None):
+        max_age = get_max_age(expire_after)
+        if max_age == 0:
+            return None
+
+        with self.lock:
+            if self.path is None:
+                row = self.payloads.get(key)
+            else:
+                row = self.get_connection().execute("SELECT payload, created, expires FROM payloads WHERE key = ?", (key,)).fetchone()
+
+        if row is None:
+            return None
+
+        payload, created, expires = row
+        now = time.time()
+
+        if (expires is not None and now >= expires) or (max_age is not None and now - created >= max_age):
+            return None
+
+        return json_loads(payload)
+
+    def set(self, key, data, expire_after=None):
+        ttl = get_ttl(expire_after)
+        if ttl == 0:
+            return
+
+        now = time.time()
+        row = (json_dumps(data), now, now + ttl if ttl is not None else None)
+
+        with self.lock:
+            if self.path is None:
+                self.payloads[key] = row
+            else:
+                connection = self.get_connection()
+                connection.execute("INSERT OR REPLACE INTO payloads (key, payload, created, expires) VALUES (?, ?, ?, ?)", (key, *row))
+                connection.commit()
+
+    def clear(self):
+        with self.lock:
+            self.payloads.clear()
+
+            if self.path is not None:
+                connection = self.get_connection()
+                connection.execute("DELETE FROM payloads")
+                connection.commit()
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -0,0 +1,144 @@
+import random
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+
+# Responses worth retrying: throttling and server errors
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# Endpoints that change data. The server may have applied the request before a server error or a
+# timeout, so they are only retried when they were throttled or couldn't connect to the server
+WRITE_ENDPOINTS = ["CREATE_COMMENT_ENDPOINT", "UPDATE_COMMENT_ENDPOINT", "PERFORM_COMMENT_ACTION_ENDPOINT"]
+
+# Path of each endpoint of the FORMAT_URLS tables, the same names as requests_handler.CACHE_POLICY
+ENDPOINT_PATHS = [
+    ("/youtubei/v1/browse", "BROWSE_ENDPOINT"),
+    ("/youtubei/v1/comment/create_comment", "CREATE_COMMENT_ENDPOINT"),
+    ("/youtubei/v1/comment/update_comment", "UPDATE_COMMENT_ENDPOINT"),
+    ("/youtubei/v1/comment/perform_comment_action", "PERFORM_COMMENT_ACTION_ENDPOINT"),
+    ("/post/", "POST"),
+]
+
+
+def get_endpoint(url):
+    path = urlsplit(url).path
+
+    for prefix, endpoint in ENDPOINT_PATHS:
+        if path.startswith(prefix):
+            return endpoint
+
+    if path.endswith("/posts") or path.endswith("/community"):
+        return "COMMUNITY_TAB"
+
+    return None
+
+
+def is_write(url):
+    return get_endpoint(url) in WRITE_ENDPOINTS
+
+
+def is_retry_status(url, status_code):
+    if is_write(url):
+        return status_code == 429
+
+    return status_code in RETRY_STATUS_CODES
+
+
+def is_incomplete_response(url, content):
+    # A browse response cut short: a body that isn't a whole JSON object or that has no responseContext.
+    # A valid response without continuation items (e.g. an empty page of replies) is complete. The body
+    # isn't parsed, the caller parses it once with load_json
+    if get_endpoint(url) != "BROWSE_ENDPOINT":
+        return False
+
+    body = content.strip()
+
+    return not (body.startswith(b"{") and body.endswith(b"}") and b'"responseContext"' in body)
+
+
+def get_backoff(attempt, backoff=0.5, max_backoff=30, retry_after=None):
+    # Exponential backoff with full jitter, never shorter than the Retry-After of the response
+    delay = random.uniform(0, min(max_backoff, backoff * 2**attempt))
+
+    try:
+        delay = max(delay, min(max_backoff, float(retry_after)))
+    except (TypeError, ValueError):
+        pass
+
+    return delay
+
+
+class TokenBucket(object):
+    # rate tokens per second, up to burst of them saved while idle. The rate is halved
+    # each time the server throttles and recovers slowly with the successful requests
+    def __init__(self, rate, burst=None, min_rate=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.min_rate = min_rate if min_rate is not None else rate / 16
+
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def reserve(self):
+        # Takes a token and returns how long to wait before using it
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def throttled(self):
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def succeeded(self):
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 100)
+
+
+class RateLimiter(object):
+    # A global rate (requests per second, None for no limit) and optional per-endpoint rates,
+    # endpoint_rates = {"BROWSE_ENDPOINT": 2, ...}. A request waits for both buckets
+    def __init__(self, rate=None, burst=None, endpoint_rates=None):
+        self.buckets = {}
+
+        if rate is not None:
+            self.set_rate(None, rate, burst=burst)
+
+        for endpoint, endpoint_rate in (endpoint_rates or {}).items():
+            self.set_rate(endpoint, endpoint_rate)
+
+    def set_rate(self, endpoint, rate, burst=None):
+        if rate is None:
+            self.buckets.pop(endpoint, None)
+        else:
+            self.buckets[endpoint] = TokenBucket(rate, burst=burst)
+
+    def get_buckets(self, url):
+        endpoint = get_endpoint(url)
+        buckets = [self.buckets[None]] if None in self.buckets else []
+
+        if endpoint is not None and endpoint in self.buckets:
+            buckets.append(self.buckets[endpoint])
+
+        return buckets
+
+    def reserve(self, url):
+        return max([bucket.reserve() for bucket in self.get_buckets(url)], default=0)
+
+    def acquire(self, url):
+        delay = self.reserve(url)
+        if delay > 0:
+            time.sleep(delay)
+
+    def throttled(self, url):
+        for bucket in self.get_buckets(url):
+            bucket.throttled()
+
+    def succeeded(self, url):
+        for bucket in self.get_buckets(url):
+            bucket.succeeded()
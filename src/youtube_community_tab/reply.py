@@ -1,20 +1,23 @@
-import json
-
-from .helpers.utils import safely_get_value_from_key
+from .helpers.json_backend import json_dumps
+from .helpers.utils import get_keep_raw
+from .schema import parse_reply
 
 
 class Reply(object):
+    __slots__ = ("reply_id", "author", "content_text", "vote_count", "raw_data")
+
     def __init__(self, reply_id, author=None, content_text=None, vote_count=None):
         self.reply_id = reply_id
         self.author = author
         self.content_text = content_text
         self.vote_count = vote_count
+        self.raw_data = None
 
     def as_json(self):
         return {"reply_id": self.reply_id, "author": self.author, "content_text": self.content_text, "vote_count": self.vote_count}
 
     def __str__(self):
-        return json.dumps(self.as_json(), indent=4)
+        return json_dumps(self.as_json(), indent=True)
 
     def __repr__(self):
         return self.__str__()
@@ -25,20 +28,10 @@ class Reply(object):
         return None
 
     @staticmethod
-    def from_data(data):
-        reply = Reply(
-            data["commentId"],
-            content_text=safely_get_value_from_key(data, "contentText"),
-            author={
-                "authorText": safely_get_value_from_key(data, "authorText"),
-                "authorThumbnail": safely_get_value_from_key(data, "authorThumbnail"),
-                "authorEndpoint": safely_get_value_from_key(data, "authorEndpoint", "browseEndpoint"),
-                "authorIsChannelOwner": safely_get_value_from_key(data, "authorIsChannelOwner"),
-                "sponsorCommentBadge": safely_get_value_from_key(data, "sponsorCommentBadge"),
-            },
-            vote_count=safely_get_value_from_key(data, "voteCount"),
-        )
-
-        reply.raw_data = data
+    def from_data(data, keep_raw=None):
+        reply = Reply(**parse_reply(data))
+
+        if get_keep_raw(keep_raw):
+            reply.raw_data = data
 
         return reply
@@ -1,7 +1,459 @@
+import json
 import os
-from requests_cache import CachedSession
+import time
+import requests
+import requests_cache as requests_cache_module
+from hashlib import sha256
+from requests.adapters import HTTPAdapter
+from requests.utils import dict_from_cookiejar
+from urllib.parse import urlsplit
+from urllib3.exceptions import NewConnectionError
+from threading import Lock, BoundedSemaphore
+from requests_cache import DO_NOT_CACHE
+from requests_cache.cache_keys import create_key
+
+from .helpers.utils import extract_yt_initial_data
+from .memory_cache import MemoryCache
+from .rate_limiter import get_backoff, get_endpoint, is_incomplete_response, is_retry_status, is_write
 
 dirname = os.path.dirname(__file__)
 CACHE_FILE_PATH = os.path.join(dirname, "requests_cache.sqlite")
 
-requests_cache = CachedSession(allowable_methods=("GET", "POST"), cache_name=CACHE_FILE_PATH)
+BROWSE_ENDPOINT_PATH = "/youtubei/v1/browse"
+
+# Default of the options of Client.configure, the ones left to it aren't changed
+UNSET = object()
+
+
+def get_auth_identity(request):
+    # The Authorization header changes every second, so the SAPISID cookie
+    # and the selected account are what identify the user
+    sapisid = ""
+    for cookie in request.headers.get("Cookie", "").split(";"):
+        name, _, value = cookie.strip().partition("=")
+        if name == "SAPISID":
+            sapisid = value
+            break
+
+    return f"{sapisid}:{request.headers.get('X-Goog-AuthUser', '')}"
+
+
+def create_cache_key(request, **kwargs):
+    # Browse continuations carry clickTracking and visitorData, which change between sessions,
+    # so they are keyed on the continuation token and the auth identity only
+    if request.method == "POST" and BROWSE_ENDPOINT_PATH in request.url and request.body:
+        try:
+            continuation = json.loads(request.body).get("continuation")
+        except (ValueError, AttributeError):
+            continuation = None
+
+        if continuation:
+            key = sha256()
+            for part in [BROWSE_ENDPOINT_PATH, continuation, get_auth_identity(request)]:
+                key.update(part.encode())
+                key.update(b"\0")
+            return key.hexdigest()[:16]
+
+    return create_key(request, **kwargs)
+
+
+CACHE_STATS = {"hits": 0, "misses": 0}
+cache_stats_lock = Lock()
+
+
+def get_cache_stats():
+    with cache_stats_lock:
+        stats = dict(CACHE_STATS)
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+
+    return stats
+
+
+def reset_cache_stats():
+    with cache_stats_lock:
+        CACHE_STATS["hits"] = 0
+        CACHE_STATS["misses"] = 0
+
+
+# Header set by requests_cache on the requests sent with expire_after=DO_NOT_CACHE
+DO_NOT_CACHE_HEADER = "X-ACTUAL-NO-CACHE"
+
+
+class CachedSession(requests_cache_module.CachedSession):
+    def send(self, request, **kwargs):
+        # requests_cache passes expire_after=DO_NOT_CACHE from request() to send() as this header
+        # (see requests_cache.policy.set_request_headers). It skips the lookup for it but still
+        # saves the response, so those requests (the comment writes) skip the cache entirely
+        if request.headers.pop(DO_NOT_CACHE_HEADER, None) is not None:
+            kwargs.pop("expire_after", None)
+            return requests.Session.send(self, request, **kwargs)
+
+        response = super().send(request, **kwargs)
+
+        with cache_stats_lock:
+            CACHE_STATS["hits" if getattr(response, "from_cache", False) else "misses"] += 1
+
+        return response
+
+
+def is_connect_failure(error):
+    # The connection couldn't be opened (refused, unknown host or connect timeout), so the request
+    # never reached the server
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+
+    return bool(error.args) and isinstance(getattr(error.args[0], "reason", None), NewConnectionError)
+
+
+class ThrottledAdapter(HTTPAdapter):
+    # Transport of the Client sessions, so only the requests that reach the network (not the
+    # cache hits) are rate limited and retried on throttling, server and connection errors. The writes
+    # are only retried on throttling and when they couldn't connect, see rate_limiter.WRITE_ENDPOINTS
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def send(self, request, **kwargs):
+        client = self.client
+
+        for attempt in range(client.retries + 1):
+            if client.rate_limiter is not None:
+                client.rate_limiter.acquire(request.url)
+
+            start = time.perf_counter()
+            try:
+                response = super().send(request, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == client.retries or (is_write(request.url) and not is_connect_failure(e)):
+                    raise e
+
+                time.sleep(get_backoff(attempt, client.backoff, client.max_backoff))
+                continue
+
+            client.observe(request.url, "network", start, response)
+
+            if not is_retry_status(request.url, response.status_code) or attempt == client.retries:
+                if client.rate_limiter is not None and response.status_code < 400:
+                    client.rate_limiter.succeeded(request.url)
+
+                return response
+
+            if client.rate_limiter is not None and response.status_code == 429:
+                client.rate_limiter.throttled(request.url)
+
+            delay = get_backoff(attempt, client.backoff, client.max_backoff, retry_after=response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(delay)
+
+
+class Client(object):
+    # A CachedSession created on the first request, so creating a Client does no I/O.
+    # backend is "sqlite" (cache_name is the file path), "filesystem" (cache_name is a directory),
+    # "memory" or None to disable caching. Extra kwargs are passed to CachedSession.
+    # memory_cache is a MemoryCache kept in front of the backend, None disables it.
+    # payload_cache is an optional PayloadCache for the ytInitialData of the pages.
+    # max_per_host bounds how many requests are sent at once to the same host, None means no limit.
+    # rate_limiter is an optional RateLimiter. Throttled, failed and incomplete responses are retried
+    # up to retries times, waiting a jittered exponential backoff (seconds) between the attempts.
+    # metrics is an optional MetricsRegistry timing the requests and the parsing of their responses
+    BACKENDS = ["sqlite", "filesystem", "memory", None]
+
+    def __init__(
+        self,
+        backend="sqlite",
+        cache_name=CACHE_FILE_PATH,
+        cookies=None,
+        memory_cache=True,
+        payload_cache=None,
+        max_per_host=None,
+        rate_limiter=None,
+        retries=3,
+        backoff=0.5,
+        max_backoff=30,
+        metrics=None,
+        **session_kwargs,
+    ):
+        self.session = None
+        self.lock = Lock()
+        self.pending_cookies = None
+        self.session_kwargs = {}
+        self.host_semaphores = {}
+        self.configure(
+            backend=backend,
+            cache_name=cache_name,
+            cookies=cookies,
+            memory_cache=memory_cache,
+            payload_cache=payload_cache,
+            max_per_host=max_per_host,
+            rate_limiter=rate_limiter,
+            retries=retries,
+            backoff=backoff,
+            max_backoff=max_backoff,
+            metrics=metrics,
+            **session_kwargs,
+        )
+
+    def configure(
+        self,
+        backend=UNSET,
+        cache_name=UNSET,
+        cookies=UNSET,
+        memory_cache=UNSET,
+        payload_cache=UNSET,
+        max_per_host=UNSET,
+        rate_limiter=UNSET,
+        retries=UNSET,
+        backoff=UNSET,
+        max_backoff=UNSET,
+        metrics=UNSET,
+        **session_kwargs,
+    ):
+        # Only the options that are passed are changed. A new backend, cache_name or session kwargs
+        # close the session (its cookies are kept), the next request creates one with them
+        if backend is not UNSET and backend not in Client.BACKENDS:
+            raise ValueError(f"[backend={backend} is not supported, use one of {Client.BACKENDS}]")
+
+        with self.lock:
+            if backend is not UNSET or cache_name is not UNSET or session_kwargs:
+                if self.session is not None:
+                    self.pending_cookies = self.session.cookies
+                    self.session.close()
+                    self.session = None
+
+            if cookies is not UNSET and cookies is not None:
+                if self.session is not None:
+                    self.session.cookies = cookies
+                else:
+                    self.pending_cookies = cookies
+
+            if session_kwargs:
+                self.session_kwargs = session_kwargs
+            if memory_cache is not UNSET:
+                self.memory_cache = MemoryCache() if memory_cache is True else memory_cache
+            if max_per_host is not UNSET:
+                self.max_per_host = max_per_host
+                self.host_semaphores = {}
+
+            options = {
+                "backend": backend,
+                "cache_name": cache_name,
+                "payload_cache": payload_cache,
+                "rate_limiter": rate_limiter,
+                "retries": retries,
+                "backoff": backoff,
+                "max_backoff": max_backoff,
+                "metrics": metrics,
+            }
+            for name, value in options.items():
+                if value is not UNSET:
+                    setattr(self, name, value)
+
+    def get_session(self):
+        if self.session is None:
+            with self.lock:
+                if self.session is None:
+                    self.session = self.create_session()
+
+        return self.session
+
+    def create_session(self):
+        session_kwargs = {"allowable_methods": ("GET", "POST"), "key_fn": create_cache_key}
+        session_kwargs.update(self.session_kwargs)
+
+        if self.backend is None:
+            session = CachedSession(backend="memory", **session_kwargs)
+            session.settings.disabled = True
+        elif self.backend == "memory":
+            session = CachedSession(backend="memory", **session_kwargs)
+        else:
+            session = CachedSession(cache_name=self.cache_name, backend=self.backend, **session_kwargs)
+
+        if self.pending_cookies is not None:
+            session.cookies = self.pending_cookies
+            self.pending_cookies = None
+
+        adapter = ThrottledAdapter(self)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+        return session
+
+    @property
+    def cookies(self):
+        # Reading the cookies doesn't create the session
+        if self.session is not None:
+            return self.session.cookies
+
+        if self.pending_cookies is None:
+            self.pending_cookies = requests.cookies.RequestsCookieJar()
+
+        return self.pending_cookies
+
+    @cookies.setter
+    def cookies(self, cookies):
+        if self.session is not None:
+            self.session.cookies = cookies
+        else:
+            self.pending_cookies = cookies
+
+    def request(self, method, url, expire_after=None, **kwargs):
+        session = self.get_session()
+        start = time.perf_counter()
+        key = None
+
+        if self.memory_cache is not None and not session.settings.disabled and expire_after != DO_NOT_CACHE:
+            request = requests.Request(
+                method, url, headers=kwargs.get("headers"), params=kwargs.get("params"), data=kwargs.get("data"), json=kwargs.get("json")
+            )
+            key = session.cache.create_key(session.prepare_request(request))
+
+            response = self.memory_cache.get(key, expire_after)
+            self.observe(url, "cache_lookup", start, response, cache=response is not None)
+
+            if response is not None:
+                self.observe(url, "request", start, response, cache=True)
+                return response
+
+        for attempt in range(self.retries + 1):
+            sent = time.perf_counter()
+            response = self.send_request(session, method, url, expire_after=expire_after, **kwargs)
+
+            if getattr(response, "from_cache", False):
+                self.observe(url, "cache_lookup", sent, response, cache=True)
+
+            # The responses from the cache were checked before being saved
+            incomplete = response.status_code == 200 and not getattr(response, "from_cache", False) and is_incomplete_response(url, response.content)
+            if not incomplete:
+                break
+
+            # The incomplete response must not be served again from the cache. It is a 200, so it
+            # isn't a throttling signal for the rate limiter
+            session.cache.delete(requests=[response.request])
+            if attempt == self.retries:
+                break
+
+            time.sleep(get_backoff(attempt, self.backoff, self.max_backoff))
+
+        if key is not None and not incomplete:
+            self.memory_cache.set(key, response, expire_after)
+
+        self.observe(url, "request", start, response, cache=getattr(response, "from_cache", False))
+
+        return response
+
+    def observe(self, url, stage, start, response=None, cache=None):
+        # Records the time since start (and the size of the response) in the metrics, if any
+        if self.metrics is not None:
+            num_bytes = len(response.content) if response is not None else 0
+            self.metrics.observe(get_endpoint(url), stage, time.perf_counter() - start, num_bytes, cache)
+
+    def send_request(self, session, method, url, **kwargs):
+        if self.max_per_host is None:
+            return session.request(method, url, **kwargs)
+
+        with self.get_host_semaphore(url):
+            return session.request(method, url, **kwargs)
+
+    def get_host_semaphore(self, url):
+        host = urlsplit(url).netloc
+
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = BoundedSemaphore(self.max_per_host)
+
+            return self.host_semaphores[host]
+
+    def get_initial_data(self, url, trim=None, expire_after=None, headers=None):
+        # Returns the status code of a page and its ytInitialData (None if the status isn't 200).
+        # With a payload cache, only the data returned by trim is kept and the page itself
+        # skips the HTTP cache
+        if self.payload_cache is None:
+            r = self.get(url, expire_after=expire_after, headers=headers)
+            if r.status_code != 200:
+                return r.status_code, None
+
+            start = time.perf_counter()
+            data = extract_yt_initial_data(r.text)
+            self.observe(url, "extract", start, r)
+
+            return r.status_code, data
+
+        sapisid = dict_from_cookiejar(self.cookies).get("SAPISID", "")
+        key = f"{url}|{sha256(sapisid.encode()).hexdigest()[:16]}"
+
+        start = time.perf_counter()
+        data = self.payload_cache.get(key, expire_after)
+        self.observe(url, "cache_lookup", start, cache=data is not None)
+
+        if data is not None:
+            return 200, data
+
+        r = self.get(url, expire_after=DO_NOT_CACHE, headers=headers)
+        if r.status_code != 200:
+            return r.status_code, None
+
+        start = time.perf_counter()
+        data = extract_yt_initial_data(r.text)
+        self.observe(url, "extract", start, r)
+
+        if trim is not None:
+            data = trim(data)
+
+        self.payload_cache.set(key, data, expire_after)
+
+        return r.status_code, data
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+
+    def __getattr__(self, name):
+        # Everything else (cache, cache_disabled, headers, ...) comes from the CachedSession
+        if name in ["session", "lock", "pending_cookies", "memory_cache", "payload_cache", "max_per_host", "host_semaphores", "rate_limiter", "metrics"]:
+            raise AttributeError(name)
+
+        return getattr(self.get_session(), name)
+
+
+# Default client, used by every object that isn't given one
+requests_cache = Client()
+
+# Expiration (in seconds) used for each endpoint of the FORMAT_URLS tables when the caller
+# doesn't pass expire_after. The read endpoints default to 0 (always fetched, nothing stored by
+# the backend, the MemoryCache nor the PayloadCache) like the expire_after=0 of the original API,
+# so caching is opt-in. DO_NOT_CACHE means the request never reads nor writes the cache,
+# even if the caller asks for it, which is what the endpoints that change data need
+CACHE_POLICY = {
+    "COMMUNITY_TAB": 0,
+    "POST": 0,
+    "BROWSE_ENDPOINT": 0,
+    "CREATE_COMMENT_ENDPOINT": DO_NOT_CACHE,
+    "UPDATE_COMMENT_ENDPOINT": DO_NOT_CACHE,
+    "PERFORM_COMMENT_ACTION_ENDPOINT": DO_NOT_CACHE,
+}
+
+
+def set_cache_policy(endpoint, expire_after):
+    if endpoint not in CACHE_POLICY:
+        raise KeyError(f"[There is no endpoint={endpoint}]")
+
+    CACHE_POLICY[endpoint] = expire_after
+
+
+def get_expire_after(endpoint, expire_after=None):
+    policy = CACHE_POLICY[endpoint]
+
+    if expire_after is None or policy == DO_NOT_CACHE:
+        return policy
+
+    return expire_after
@@ -0,0 +1,93 @@
+from .helpers.clean_items import clean_content_text, clean_backstage_attachment, clean_author_text, clean_author_endpoint
+from .helpers.utils import safely_get_value_from_key, intern_strings
+
+# Where the fields of the models are in the renderers. Each renderer is read in a single pass and
+# isn't modified, so it can be discarded once parsed. A KeyError is raised when a required field is missing
+REPLIES_CONTINUATION_PATH = ["replies", "commentRepliesRenderer", "contents", 0, "continuationItemRenderer", "continuationEndpoint"]
+
+
+def check_required(fields, required):
+    for name in required:
+        if fields[name] is None:
+            raise KeyError(f"[Can't find {name} in the data]")
+
+    return fields
+
+
+def get_comment_author(data):
+    return intern_strings(
+        {
+            "authorText": data.get("authorText"),
+            "authorThumbnail": data.get("authorThumbnail"),
+            "authorEndpoint": safely_get_value_from_key(data, "authorEndpoint", "browseEndpoint"),
+            "authorIsChannelOwner": data.get("authorIsChannelOwner"),
+            "sponsorCommentBadge": data.get("sponsorCommentBadge"),
+        }
+    )
+
+
+# commentRenderer, as a Reply
+def parse_reply(data):
+    fields = {
+        "reply_id": data.get("commentId"),
+        "content_text": data.get("contentText"),
+        "author": get_comment_author(data),
+        "vote_count": data.get("voteCount"),
+    }
+
+    return check_required(fields, ["reply_id"])
+
+
+# commentRenderer, as a Comment
+def parse_comment(data):
+    fields = {
+        "comment_id": data.get("commentId"),
+        "content_text": data.get("contentText"),
+        "author": get_comment_author(data),
+        "vote_count": data.get("voteCount"),
+    }
+
+    return check_required(fields, ["comment_id"])
+
+
+# commentThreadRenderer, its commentRenderer and the continuation of its replies
+def parse_comment_thread(data):
+    fields = parse_comment(safely_get_value_from_key(data, "comment", "commentRenderer", default={}))
+
+    continuation = safely_get_value_from_key(data, *REPLIES_CONTINUATION_PATH)
+    fields["replies_continuation_token"] = safely_get_value_from_key(continuation, "continuationCommand", "token")
+    fields["click_tracking_params"] = safely_get_value_from_key(continuation, "clickTrackingParams")
+
+    return fields
+
+
+def parse_post(data, content_key, author_text_key, author_endpoint_key):
+    fields = {
+        "post_id": data.get("postId"),
+        "channel_id": intern_strings(safely_get_value_from_key(data, author_endpoint_key, "browseEndpoint", "browseId")),
+        "author": intern_strings(
+            {
+                "authorText": clean_author_text(data.get(author_text_key)),
+                "authorThumbnail": data.get("authorThumbnail"),
+                "authorEndpoint": clean_author_endpoint(data.get(author_endpoint_key)),
+            }
+        ),
+        "content_text": clean_content_text(data.get(content_key)),
+        "backstage_attachment": clean_backstage_attachment(data.get("backstageAttachment")),
+        "vote_count": data.get("voteCount"),
+        "sponsor_only_badge": data.get("sponsorsOnlyBadge"),
+        "published_time_text": safely_get_value_from_key(data, "publishedTimeText", "runs", 0, "text"),
+        "original_post": data.get("originalPost"),
+    }
+
+    return check_required(fields, ["post_id", "channel_id"])
+
+
+# backstagePostRenderer. original_post is the raw renderer, Post.from_data parses it
+def parse_backstage_post(data):
+    return parse_post(data, "contentText", "authorText", "authorEndpoint")
+
+
+# sharedPostRenderer, the same fields under other names
+def parse_shared_post(data):
+    return parse_post(data, "content", "displayName", "endpoint")
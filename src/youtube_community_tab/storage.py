@@ -0,0 +1,99 @@
+import sqlite3
+import time
+from threading import Lock
+
+from .helpers.json_backend import json_loads, json_dumps
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS posts (post_id TEXT PRIMARY KEY, channel_id TEXT, data TEXT, updated REAL)",
+    "CREATE TABLE IF NOT EXISTS comments (comment_id TEXT PRIMARY KEY, post_id TEXT, channel_id TEXT, data TEXT, updated REAL)",
+    "CREATE TABLE IF NOT EXISTS replies (reply_id TEXT PRIMARY KEY, comment_id TEXT, post_id TEXT, data TEXT, updated REAL)",
+    "CREATE INDEX IF NOT EXISTS posts_channel_id ON posts (channel_id)",
+    "CREATE INDEX IF NOT EXISTS comments_post_id ON comments (post_id)",
+    "CREATE INDEX IF NOT EXISTS comments_channel_id ON comments (channel_id)",
+    "CREATE INDEX IF NOT EXISTS replies_comment_id ON replies (comment_id)",
+    "CREATE INDEX IF NOT EXISTS replies_post_id ON replies (post_id)",
+]
+
+
+class Storage(object):
+    # SQLite store of the crawled posts, comments and replies (their as_json, keyed by id). Objects
+    # with a storage save each page as it's loaded, in one transaction, replacing what was stored
+    # for the same ids. path=":memory:" keeps everything in memory
+    def __init__(self, path="youtube_community_tab.sqlite"):
+        self.path = path
+        self.lock = Lock()
+        self.connection = None
+
+    def get_connection(self):
+        if self.connection is None:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False)
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            self.connection.commit()
+
+        return self.connection
+
+    def upsert(self, statement, rows):
+        if len(rows) == 0:
+            return
+
+        with self.lock:
+            connection = self.get_connection()
+            connection.executemany(statement, rows)
+            connection.commit()
+
+    def save_posts(self, posts):
+        now = time.time()
+
+        self.upsert(
+            "INSERT INTO posts (post_id, channel_id, data, updated) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (post_id) DO UPDATE SET channel_id = excluded.channel_id, data = excluded.data, updated = excluded.updated",
+            [(post.post_id, post.channel_id, json_dumps(post.as_json()), now) for post in posts],
+        )
+
+    def save_comments(self, comments):
+        now = time.time()
+
+        self.upsert(
+            "INSERT INTO comments (comment_id, post_id, channel_id, data, updated) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (comment_id) DO UPDATE SET post_id = excluded.post_id, channel_id = excluded.channel_id, data = excluded.data, updated = excluded.updated",
+            [(comment.comment_id, comment.post_id, comment.channel_id, json_dumps(comment.as_json()), now) for comment in comments],
+        )
+
+    def save_replies(self, comment, replies):
+        now = time.time()
+
+        self.upsert(
+            "INSERT INTO replies (reply_id, comment_id, post_id, data, updated) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (reply_id) DO UPDATE SET comment_id = excluded.comment_id, post_id = excluded.post_id, data = excluded.data, updated = excluded.updated",
+            [(reply.reply_id, comment.comment_id, comment.post_id, json_dumps(reply.as_json()), now) for reply in replies],
+        )
+
+    def query(self, statement, parameters=()):
+        with self.lock:
+            return self.get_connection().execute(statement, parameters).fetchall()
+
+    def get_post(self, post_id):
+        rows = self.query("SELECT data FROM posts WHERE post_id = ?", (post_id,))
+
+        return json_loads(rows[0][0]) if len(rows) > 0 else None
+
+    def get_post_ids(self, channel_id):
+        # The known posts of a channel, e.g. the seen_post_ids of CommunityTab.iter_new_posts
+        return set(row[0] for row in self.query("SELECT post_id FROM posts WHERE channel_id = ?", (channel_id,)))
+
+    def get_posts(self, channel_id):
+        return [json_loads(row[0]) for row in self.query("SELECT data FROM posts WHERE channel_id = ?", (channel_id,))]
+
+    def get_comments(self, post_id):
+        return [json_loads(row[0]) for row in self.query("SELECT data FROM comments WHERE post_id = ?", (post_id,))]
+
+    def get_replies(self, comment_id):
+        return [json_loads(row[0]) for row in self.query("SELECT data FROM replies WHERE comment_id = ?", (comment_id,))]
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
@@ -1,6 +1,6 @@
 from http import cookiejar
 from youtube_community_tab.requests_handler import requests_cache
-from youtube_community_tab.helpers import search_key
+from youtube_community_tab.helpers import find_key
 from youtube_community_tab import Post
 import time
 
@@ -18,24 +18,16 @@ def test_actions():
     assert comment is not None
 
     r = comment.set_like_comment()
-    s = search_key("status", r)
-
-    assert len(s) > 0 and s[0][1] == "STATUS_SUCCEEDED"
+    assert find_key("status", r) == "STATUS_SUCCEEDED"
 
     r = comment.update_comment(f"[Edited][Current timestamp: {time.time()}]")
-    s = search_key("status", r)
-
-    assert len(s) > 0 and s[0][1] == "STATUS_SUCCEEDED"
+    assert find_key("status", r) == "STATUS_SUCCEEDED"
 
     r = comment.set_dislike_comment()
-    s = search_key("status", r)
-
-    assert len(s) > 0 and s[0][1] == "STATUS_SUCCEEDED"
+    assert find_key("status", r) == "STATUS_SUCCEEDED"
 
     r = comment.delete_comment()
-    s = search_key("status", r)
-
-    assert len(s) > 0 and s[0][1] == "STATUS_SUCCEEDED"
+    assert find_key("status", r) == "STATUS_SUCCEEDED"
 
 
 if __name__ == "__main__":
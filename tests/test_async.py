@@ -0,0 +1,126 @@
+import asyncio
+import gc
+import warnings
+
+from youtube_community_tab import AsyncClient, AsyncComment, AsyncCommunityTab, AsyncPost, set_base_url
+from youtube_community_tab.async_requests_handler import get_default_async_client
+from youtube_community_tab.fake_server import FakeYouTubeServer, get_post_id
+
+
+async def load_community_tab():
+    async with AsyncClient(max_concurrency=4) as client:
+        ct = AsyncCommunityTab("vsauce1", client=client)
+        await ct.load_posts()
+
+        num_posts = len(ct.posts)
+
+        assert num_posts > 0
+        assert ct.posts_continuation_token
+
+        await ct.load_posts()
+
+        assert len(ct.posts) > num_posts
+
+        post = ct.posts[-1]
+        await post.load_comments()
+
+        assert len(post.comments) > 0
+
+        replied_comments = list(filter(lambda x: x.replies_continuation_token, post.comments))
+
+        if len(replied_comments) > 0:
+            await asyncio.gather(*[comment.load_replies() for comment in replied_comments])
+
+            assert any(len(comment.replies) > 0 for comment in replied_comments)
+
+
+async def load_post():
+    async with AsyncClient() as client:
+        post = await AsyncPost.from_post_id("UgznJEQUR0fJzoMlS2Z4AaABCQ", client=client)
+
+        # This post can be edited, so this test can fail in the future
+        assert post.get_text() == "Vsauce is 11 years old today!!!!"
+
+        await post.load_comments()
+
+        assert len(post.comments) > 0
+
+        await post.load_all_replies(max_workers=4)
+
+        assert all(not comment.replies_continuation_token for comment in post.comments)
+
+
+def test_async_community_tab():
+    asyncio.run(load_community_tab())
+
+
+def test_async_post():
+    asyncio.run(load_post())
+
+
+async def load_fake_posts():
+    ct = AsyncCommunityTab("fake")
+    await ct.load_posts()
+
+    return len(ct.posts), get_default_async_client().session
+
+
+def test_async_default_client_event_loops():
+    with FakeYouTubeServer(num_pages=1, posts_per_page=3) as server:
+        set_base_url(server.url)
+
+        try:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+
+                # The default client is shared by both runs, each of them gets a session in its own loop
+                num_posts, first_session = asyncio.run(load_fake_posts())
+                assert num_posts == 3
+                assert first_session.closed
+
+                num_posts, second_session = asyncio.run(load_fake_posts())
+                assert num_posts == 3
+                assert second_session.closed and second_session is not first_session
+
+                del first_session, second_session
+                gc.collect()
+
+            assert not [w for w in caught if "Unclosed" in str(w.message)]
+        finally:
+            set_base_url()
+
+
+async def write_fake_comments():
+    async with AsyncClient() as client:
+        post = await AsyncPost.from_post_id(get_post_id("fake", 0), client=client)
+
+        # The writes await the AsyncClient, like the reads
+        comment = await post.create_comment("Hello")
+        assert isinstance(comment, AsyncComment)
+        assert comment.comment_id.startswith("Ugw_created_")
+
+        assert (await comment.update_comment("Hello again"))["actionResult"]["status"] == "STATUS_SUCCEEDED"
+
+        for action in [comment.set_like_comment(), comment.set_dislike_comment(False), comment.delete_comment()]:
+            assert (await action)["actionResults"][0]["status"] == "STATUS_SUCCEEDED"
+
+
+def test_async_writes():
+    with FakeYouTubeServer(num_pages=1, posts_per_page=2) as server:
+        set_base_url(server.url)
+
+        try:
+            asyncio.run(write_fake_comments())
+
+            assert server.requests["CREATE_COMMENT_ENDPOINT"] == 1
+            assert server.requests["UPDATE_COMMENT_ENDPOINT"] == 1
+            assert server.requests["PERFORM_COMMENT_ACTION_ENDPOINT"] == 3
+        finally:
+            set_base_url()
+
+
+if __name__ == "__main__":
+    test_async_community_tab()
+    test_async_post()
+    test_async_default_client_event_loops()
+    test_async_writes()
@@ -0,0 +1,44 @@
+import tempfile
+from pathlib import Path
+
+from youtube_community_tab import CheckpointStore, CommunityTab, Post, Comment, AsyncPost
+
+
+def test_checkpoints(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+    ct = CommunityTab("vsauce1")
+    ct.channel_id = "UC6nSFpj9HTCZ5t-N3Rm3-HA"
+    ct.posts_continuation_token = "posts_token"
+    ct.visitor_data = "visitor"
+
+    post = Post("UgznJEQUR0fJzoMlS2Z4AaABCQ", channel_id=ct.channel_id)
+    post.comments_continuation_token = "comments_token"
+    post.first = False
+
+    comment = Comment(post.post_id, "UgyTIomDXMuKf3NTo294AaABAg", channel_id=ct.channel_id, replies_continuation_token="replies_token")
+
+    for obj in [ct, post, comment]:
+        store.save(obj)
+
+    store.close()
+
+    # The checkpoints survive the process
+    store = CheckpointStore(str(tmp_path / "checkpoints.sqlite"))
+
+    assert store.load(CommunityTab, "vsauce1").get_checkpoint() == ct.get_checkpoint()
+    assert store.load(Post, post.post_id).get_checkpoint() == post.get_checkpoint()
+    assert store.load(Comment, comment.comment_id).get_checkpoint() == comment.get_checkpoint()
+    assert store.load(Post, "other_post_id") is None
+
+    restored_post = store.load(AsyncPost, post.post_id)
+    assert isinstance(restored_post, AsyncPost)
+    assert restored_post.comments_continuation_token == "comments_token"
+    assert restored_post.first is False
+
+    store.delete(post.get_checkpoint_key())
+    assert store.load(Post, post.post_id) is None
+
+
+if __name__ == "__main__":
+    test_checkpoints(Path(tempfile.mkdtemp()))
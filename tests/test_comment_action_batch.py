@@ -0,0 +1,56 @@
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from youtube_community_tab import Client, Comment, CommentActionBatch
+
+
+class ActionHandler(BaseHTTPRequestHandler):
+    # Answers a succeeded actionResult for each action of the request
+    requests = []
+
+    def do_POST(self):
+        actions = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["actions"]
+        ActionHandler.requests.append(actions)
+
+        body = json.dumps({"actionResults": [{"status": "STATUS_SUCCEEDED"} for _ in actions]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_comment_action_batch():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ActionHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    endpoint = Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"]
+    Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"] = f"http://127.0.0.1:{server.server_port}/youtubei/v1/comment/perform_comment_action"
+
+    try:
+        comments = [Comment("UgkxpAbrgRG3trNwPVu9ipY7vALkJ_Q-c1lv", f"Ugw{i:020d}", channel_id="UCMwGHR0BTZuLsmjY_NT5Pwg") for i in range(5)]
+
+        with CommentActionBatch(client=Client(backend="memory"), batch_size=2) as batch:
+            for comment in comments:
+                batch.like(comment)
+            batch.delete(comments[0])
+
+        assert [len(actions) for actions in ActionHandler.requests] == [2, 2, 2]
+        assert ActionHandler.requests[0][0] == Comment.get_like_comment_params(True, comments[0].comment_id, comments[0].post_id, comments[0].channel_id)
+
+        assert len(batch.results) == 6
+        assert batch.results[-1] == {"action": "delete", "comment_id": comments[0].comment_id, "status": "STATUS_SUCCEEDED"}
+        assert all(result["status"] == "STATUS_SUCCEEDED" for result in batch.results)
+
+        assert CommentActionBatch.get_statuses({"actionResults": [{"status": "STATUS_FAILED"}]}, 2) == ["STATUS_FAILED", None]
+    finally:
+        Comment.FORMAT_URLS["PERFORM_COMMENT_ACTION_ENDPOINT"] = endpoint
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_comment_action_batch()
@@ -41,5 +41,23 @@ def test_community_tab():
         assert len(comment.replies) > 0
 
 
+def test_iter_new_posts():
+    ct = CommunityTab("vsauce1")
+    ct.load_posts(expire_after=EXPIRATION_TIME)
+
+    # Pretend the two newest posts appeared since the last sync
+    seen_post_ids = [post.post_id for post in ct.posts[2:]]
+
+    ct = CommunityTab("vsauce1")
+    new_posts = list(ct.iter_new_posts(seen_post_ids, expire_after=EXPIRATION_TIME))
+
+    assert len(new_posts) > 0
+    assert all(post.post_id not in seen_post_ids for post in new_posts)
+
+    # Only the first page was needed
+    assert ct.posts_continuation_token
+
+
 if __name__ == "__main__":
     test_community_tab()
+    test_iter_new_posts()
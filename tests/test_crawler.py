@@ -0,0 +1,21 @@
+from itertools import islice
+
+from youtube_community_tab import CommunityCrawler, Client
+
+EXPIRATION_TIME = 24 * 60 * 60  # requests cache expiration
+
+
+def test_crawler():
+    crawler = CommunityCrawler(["vsauce1", "UCddiUEpeqJcYeBxX1IVBKvQ", "this-channel-does-not-exist-0123"], max_workers=3, client=Client(max_per_host=4))
+
+    results = list(islice(crawler.crawl(expire_after=EXPIRATION_TIME), 30))
+
+    assert len(results) == 30
+    assert all(channel_id and post.post_id for channel_id, post in results)
+
+    # The missing channel doesn't stop the others
+    assert "this-channel-does-not-exist-0123" in crawler.errors
+
+
+if __name__ == "__main__":
+    test_crawler()
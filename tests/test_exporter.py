@@ -0,0 +1,48 @@
+import gzip
+import json
+import tempfile
+from pathlib import Path
+
+from youtube_community_tab import JsonlExporter, Post, Comment, Reply
+
+
+def read_records(paths, compression=None):
+    records = []
+    opener = gzip.open if compression == "gzip" else open
+
+    for path in paths:
+        with opener(path, "rt", encoding="utf-8") as f:
+            records += [json.loads(line) for line in f]
+
+    return records
+
+
+def test_exporter(tmp_path):
+    objs = [Post("post_0", channel_id="channel"), Comment("post_0", "comment_0", content_text={"runs": [{"text": "café"}]}), Reply("comment_0.reply_0")]
+
+    with JsonlExporter(str(tmp_path / "records.jsonl")) as exporter:
+        exporter.write_many(objs)
+
+    records = read_records(exporter.paths)
+
+    assert exporter.paths == [str(tmp_path / "records.jsonl")]
+    assert [record["type"] for record in records] == ["post", "comment", "reply"]
+    assert records[1]["content_text"]["runs"][0]["text"] == "café"
+
+
+def test_exporter_rotation(tmp_path):
+    with JsonlExporter(str(tmp_path / "records.jsonl.gz"), compression="gzip", max_bytes=1000) as exporter:
+        exporter.write_many(Post(f"post_{i}", channel_id="channel") for i in range(100))
+
+    assert len(exporter.paths) > 1
+    assert exporter.paths[0] == str(tmp_path / "records-00000.jsonl.gz")
+    assert all(Path(path).exists() for path in exporter.paths)
+
+    records = read_records(exporter.paths, compression="gzip")
+
+    assert [record["post_id"] for record in records] == [f"post_{i}" for i in range(100)]
+
+
+if __name__ == "__main__":
+    test_exporter(Path(tempfile.mkdtemp()))
+    test_exporter_rotation(Path(tempfile.mkdtemp()))
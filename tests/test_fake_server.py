@@ -0,0 +1,61 @@
+from youtube_community_tab import Client, CommunityTab, Post, Comment, CommentActionBatch, set_base_url
+from youtube_community_tab.fake_server import FakeYouTubeServer, get_post_id
+
+
+def test_fake_server():
+    with FakeYouTubeServer(num_pages=2, posts_per_page=5, comments_per_page=4, replies_per_page=3) as server:
+        set_base_url(server.url)
+
+        try:
+            client = Client(backend="memory")
+
+            ct = CommunityTab("fake", client=client)
+            posts = list(ct.iter_posts())
+            assert len(posts) == 10
+            assert ct.channel_id == "UC_fake"
+
+            post = Post.from_post_id(get_post_id("fake", 3), client=client)
+            comments = list(post.iter_comments())
+            assert len(comments) == 8
+            assert post.channel_id == "UC_fake"
+
+            replies = list(comments[0].iter_replies())
+            assert len(replies) == 6
+
+            comment = Comment.from_ids(comments[1].comment_id, post.post_id, post.channel_id, client=client)
+            assert comment.comment_id == comments[1].comment_id
+
+            with CommentActionBatch(client=client) as batch:
+                for comment in comments:
+                    batch.like(comment)
+            assert [result["status"] for result in batch.results] == ["STATUS_SUCCEEDED"] * 8
+
+            # The comment actions are sent with DO_NOT_CACHE, which requests_cache alone would still save
+            assert not [response for response in client.cache.responses.values() if "perform_comment_action" in response.url]
+
+            assert server.requests["COMMUNITY_TAB"] == 1
+            assert server.requests["PERFORM_COMMENT_ACTION_ENDPOINT"] == 1
+        finally:
+            set_base_url()
+
+
+def test_fake_server_failures():
+    with FakeYouTubeServer(num_pages=10, posts_per_page=2, throttle_rate=0.2, error_rate=0.1, incomplete_rate=0.1, seed=4) as server:
+        set_base_url(server.url)
+
+        try:
+            # Every failure is retried until the pages are complete
+            client = Client(backend="memory", retries=10, backoff=0.001)
+
+            ct = CommunityTab("fake", client=client)
+            assert len(list(ct.iter_posts())) == 20
+
+            assert server.status_codes[429] > 0
+            assert server.status_codes[500] > 0
+        finally:
+            set_base_url()
+
+
+if __name__ == "__main__":
+    test_fake_server()
+    test_fake_server_failures()
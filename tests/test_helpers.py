@@ -0,0 +1,161 @@
+import json
+
+from youtube_community_tab.helpers import (
+    search_key,
+    iter_search_key,
+    find_key,
+    extract_yt_initial_data,
+    json_loads,
+    json_dumps,
+    get_json_backend,
+    set_json_backend,
+    intern_strings,
+    get_keep_raw,
+    set_keep_raw,
+)
+from youtube_community_tab.helpers.json_backend import JSON_BACKENDS
+from youtube_community_tab.helpers.protobuf import encode_varint, encode_message
+from youtube_community_tab.comment import Comment
+from youtube_community_tab.schema import parse_comment_thread, parse_shared_post
+from youtube_community_tab.reply import Reply
+
+
+def test_extract_yt_initial_data():
+    data = {"contents": {"text": "}; </script> ytInitialData = {", "items": [1, 2, 3]}}
+    html = f"<script>var ytcfg = {{}};</script><script>var ytInitialData = {json.dumps(data)};</script><script>var x = {{}};</script>"
+
+    assert extract_yt_initial_data(html) == data
+
+
+def test_extract_yt_initial_data_missing():
+    try:
+        extract_yt_initial_data("<html></html>")
+        assert False
+    except IndexError:
+        pass
+
+
+def test_json_backends():
+    data = {"text": "caf\u00e9 ;</script>", "items": [1, 2.5, None, True]}
+    html = f"<script>var ytInitialData = {json.dumps(data)};</script>"
+    previous = get_json_backend()
+
+    try:
+        for name, module in JSON_BACKENDS.items():
+            if module is None:
+                continue
+
+            set_json_backend(name)
+
+            assert json_loads(json_dumps(data)) == data
+            assert json_loads(json_dumps(data, indent=True).encode()) == data
+
+            # The same text as the stdlib with every backend
+            assert json_dumps(data, indent=True) == json.dumps(data, indent=4)
+            assert json_dumps({"text": "caf\u00e9 \U0001f600", "url": "/post/a"}) == '{"text":"caf\u00e9 \U0001f600","url":"/post/a"}'
+            assert extract_yt_initial_data(html) == data
+    finally:
+        set_json_backend(previous)
+
+    try:
+        set_json_backend("pickle")
+        assert False
+    except KeyError:
+        pass
+
+
+def test_keep_raw():
+    data = json_loads('{"commentId": "Ugw1", "authorText": {"simpleText": "@author"}, "contentText": {"runs": [{"text": "reply"}]}}')
+    other = json_loads('{"authorText": {"simpleText": "@author"}}')
+
+    assert intern_strings(data["authorText"])["simpleText"] is intern_strings(other["authorText"])["simpleText"]
+
+    assert Reply.from_data(data).raw_data is data
+    assert Reply.from_data(data, keep_raw=False).raw_data is None
+
+    previous = get_keep_raw()
+    set_keep_raw(False)
+
+    try:
+        reply = Reply.from_data(data)
+        assert reply.raw_data is None
+        assert reply.get_text() == "reply"
+        assert reply.author["authorText"] == {"simpleText": "@author"}
+    finally:
+        set_keep_raw(previous)
+
+
+def test_protobuf():
+    assert encode_varint(1) == b"\x01"
+    assert encode_varint(300) == b"\xac\x02"
+    assert encode_message([(1, 0), (2, "ab"), (3, [(1, True)])]) == b"\x08\x00\x12\x02ab\x1a\x02\x08\x01"
+
+    # Lengths over 127 take a two bytes varint
+    long_id = "a" * 200
+    assert encode_message([(3, long_id)]) == b"\x1a\xc8\x01" + long_id.encode()
+
+    params = Comment.get_like_comment_params(True, "UgwNlz9YnI9kgo-p3bJ4AaABAg", "UgkxpAbrgRG3trNwPVu9ipY7vALkJ_Q-c1lv", "UCMwGHR0BTZuLsmjY_NT5Pwg")
+    assert params == (
+        "CAUQBxoaVWd3Tmx6OVluSTlrZ28tcDNiSjRBYUFCQWcwADgAShUxMTU1ODcwNDM2MDAxMjE2MjE3MjRQAKgBAbIBJFVna3hwQWJyZ1JHM3RyTndQVnU5aXBZN3ZBTGtKX1EtYzFsdroBGFVDTXdHSFIwQlRadUxzbWpZX05UNVB3Z_ABAQ%3D%3D"
+    )
+
+
+def test_search_key():
+    data = {"a": 1, "b": [{"a": {"a": 2}}, {"c": {"a": 3}}]}
+
+    # The value of a match isn't searched
+    assert search_key("a", data) == [(["a"], 1), (["b", 0, "a"], {"a": 2}), (["b", 1, "c", "a"], 3)]
+    assert list(iter_search_key("a", data, with_path=False)) == [1, {"a": 2}, 3]
+    assert list(iter_search_key("a", data, max_depth=3)) == [(["a"], 1), (["b", 0, "a"], {"a": 2})]
+
+    # max_depth is the longest path
+    assert list(iter_search_key("a", data, max_depth=1)) == [(["a"], 1)]
+    assert list(iter_search_key("a", data, max_depth=0)) == []
+    assert find_key("c", data, max_depth=2) is None
+    assert search_key(1, [[0, 5], 6]) == [([1], 6), ([0, 1], 5)]
+
+    assert find_key("c", data) == {"a": 3}
+    assert find_key("d", data, default=0) == 0
+
+
+def test_schema():
+    continuation = {"continuationCommand": {"token": "token"}, "clickTrackingParams": "tracking"}
+    renderer = {"commentId": "Ugw", "authorText": {"simpleText": "@author"}, "authorEndpoint": {"browseEndpoint": {"browseId": "UCa"}}}
+    thread = {
+        "comment": {"commentRenderer": renderer},
+        "replies": {"commentRepliesRenderer": {"contents": [{"continuationItemRenderer": {"continuationEndpoint": continuation}}]}},
+    }
+    text = json.dumps(thread)
+
+    fields = parse_comment_thread(thread)
+
+    assert fields["comment_id"] == "Ugw"
+    assert fields["author"]["authorEndpoint"] == {"browseId": "UCa"}
+    assert fields["content_text"] is None
+    assert (fields["replies_continuation_token"], fields["click_tracking_params"]) == ("token", "tracking")
+
+    # The renderer isn't modified
+    assert json.dumps(thread) == text
+
+    # sharedPostRenderer has the fields of backstagePostRenderer under other names
+    endpoint = {"commandMetadata": {"webCommandMetadata": {"url": "/@b"}}, "browseEndpoint": {"browseId": "UCb"}}
+    fields = parse_shared_post({"postId": "Ugkx", "content": {"runs": [{"text": "text"}]}, "endpoint": endpoint})
+
+    assert (fields["post_id"], fields["channel_id"], fields["content_text"]) == ("Ugkx", "UCb", {"runs": [{"text": "text"}]})
+    assert fields["author"]["authorEndpoint"] == {"browseId": "UCb", "url": "/@b"}
+
+    try:
+        parse_comment_thread({"replies": {}})
+        assert False
+    except KeyError:
+        pass
+
+
+if __name__ == "__main__":
+    test_extract_yt_initial_data()
+    test_extract_yt_initial_data_missing()
+    test_json_backends()
+    test_keep_raw()
+    test_protobuf()
+    test_search_key()
+    test_schema()
@@ -0,0 +1,71 @@
+from youtube_community_tab import Client, CommunityTab, Post, MetricsRegistry, set_base_url
+from youtube_community_tab.fake_server import FakeYouTubeServer, get_post_id
+
+
+def test_metrics():
+    metrics = MetricsRegistry()
+    metrics.observe("POST", "network", 0.003, 100)
+    metrics.observe("POST", "network", 0.2, 50)
+    metrics.observe("POST", "request", 0.0001, 10, cache=True)
+
+    stats = metrics.get_stats()
+    assert stats["POST"]["network"]["count"] == 2
+    assert stats["POST"]["network"]["bytes"] == 150
+    assert stats["POST"]["request"]["hits"] == 1
+
+    text = metrics.to_prometheus()
+    assert 'youtube_community_tab_stage_seconds_bucket{endpoint="POST",stage="network",le="0.0025"} 0' in text
+    assert 'youtube_community_tab_stage_seconds_bucket{endpoint="POST",stage="network",le="0.005"} 1' in text
+    assert 'youtube_community_tab_stage_seconds_bucket{endpoint="POST",stage="network",le="+Inf"} 2' in text
+    assert 'youtube_community_tab_stage_seconds_count{endpoint="POST",stage="network"} 2' in text
+    assert 'youtube_community_tab_stage_bytes_total{endpoint="POST",stage="request",cache="hit"} 10' in text
+
+    observations = []
+    metrics.add_hook(lambda *observation: observations.append(observation))
+    with metrics.time("BROWSE_ENDPOINT", "json_loads", 5):
+        pass
+    assert observations[0][:2] == ("BROWSE_ENDPOINT", "json_loads")
+
+    metrics.reset()
+    assert metrics.get_stats() == {}
+
+
+def test_client_metrics():
+    with FakeYouTubeServer(num_pages=2, posts_per_page=5, comments_per_page=4) as server:
+        set_base_url(server.url)
+
+        try:
+            metrics = MetricsRegistry()
+            client = Client(backend="memory", metrics=metrics)
+
+            for _ in range(2):
+                ct = CommunityTab("fake", client=client)
+                assert len(list(ct.iter_posts(expire_after=3600))) == 10
+
+            post = Post.from_post_id(get_post_id("fake", 0), client=client)
+            assert len(list(post.iter_comments())) == 8
+
+            stats = metrics.get_stats()
+
+            # The second time, the pages come from the cache
+            assert stats["COMMUNITY_TAB"]["request"]["count"] == 2
+            assert stats["COMMUNITY_TAB"]["request"]["hits"] == 1
+            assert stats["COMMUNITY_TAB"]["network"]["count"] == 1
+            assert stats["COMMUNITY_TAB"]["network"]["bytes"] > 0
+            assert stats["COMMUNITY_TAB"]["extract"]["count"] == 2
+            assert stats["COMMUNITY_TAB"]["from_data"]["count"] == 2
+
+            # The second page of posts (once) and the two pages of comments
+            assert stats["BROWSE_ENDPOINT"]["network"]["count"] == 3
+            assert stats["BROWSE_ENDPOINT"]["json_loads"]["count"] == 4
+            assert stats["BROWSE_ENDPOINT"]["from_data"]["count"] == 4
+            assert stats["POST"]["from_data"]["count"] == 1
+
+            assert 'stage="network"' in metrics.to_prometheus()
+        finally:
+            set_base_url()
+
+
+if __name__ == "__main__":
+    test_metrics()
+    test_client_metrics()
@@ -40,5 +40,33 @@ def test_post():
         assert test
 
 
+def test_iter_comments():
+    post = Post.from_post_id("UgznJEQUR0fJzoMlS2Z4AaABCQ", expire_after=EXPIRATION_TIME)
+
+    comments = []
+    for comment in post.iter_comments(expire_after=EXPIRATION_TIME, keep=False):
+        comments.append(comment)
+
+        if len(comments) >= 40:
+            break
+
+    assert len(comments) > 0
+    assert len(post.comments) == 0
+
+
+def test_load_all_replies():
+    post = Post.from_post_id("UgznJEQUR0fJzoMlS2Z4AaABCQ", expire_after=EXPIRATION_TIME)
+    post.load_comments(expire_after=EXPIRATION_TIME)
+
+    replied_comments = list(filter(lambda x: x.replies_continuation_token, post.comments))
+
+    post.load_all_replies(max_workers=4, expire_after=EXPIRATION_TIME)
+
+    assert all(comment.replies_continuation_token is False for comment in replied_comments)
+    assert all(len(comment.replies) > 0 for comment in replied_comments)
+
+
 if __name__ == "__main__":
     test_post()
+    test_iter_comments()
+    test_load_all_replies()
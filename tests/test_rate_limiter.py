@@ -0,0 +1,169 @@
+import requests
+import socket
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+
+from youtube_community_tab import Client, RateLimiter
+from youtube_community_tab.rate_limiter import TokenBucket, get_endpoint, get_backoff, is_incomplete_response
+from youtube_community_tab.requests_handler import is_connect_failure
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    # Answers 429 to the first request of each path, then a complete or truncated browse response.
+    # Paths with "empty" get a valid page without items right away. The comment writes get a 500
+    # after their 429, "slow" ones too late for the client
+    seen = set()
+    count = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        ThrottlingHandler.count += 1
+
+        if self.path not in ThrottlingHandler.seen and "empty" not in self.path:
+            ThrottlingHandler.seen.add(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+
+        if "/comment/" in self.path:
+            if "slow" in self.path:
+                time.sleep(0.5)
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if "full" in self.path:
+            body = b'{"responseContext": {}, "onResponseReceivedEndpoints": []}'
+        elif "empty" in self.path:
+            body = b'{"responseContext": {}, "trackingParams": "CAAQ"}'
+        else:
+            body = b'{"responseContext": {'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_endpoints():
+    assert get_endpoint("https://www.youtube.com/youtubei/v1/browse?key=abc") == "BROWSE_ENDPOINT"
+    assert get_endpoint("https://www.youtube.com/post/UgznJEQUR0fJzoMlS2Z4AaABCQ") == "POST"
+    assert get_endpoint("https://www.youtube.com/c/vsauce1/posts") == "COMMUNITY_TAB"
+    assert get_endpoint("https://www.youtube.com/youtubei/v1/comment/perform_comment_action") == "PERFORM_COMMENT_ACTION_ENDPOINT"
+
+    assert 0 <= get_backoff(3, backoff=1, max_backoff=2) <= 2
+    assert get_backoff(0, backoff=0.01, retry_after="5") == 5
+
+
+def test_incomplete_response():
+    url = "https://www.youtube.com/youtubei/v1/browse?key=abc"
+
+    assert not is_incomplete_response(url, b'{"responseContext": {}, "trackingParams": "CAAQ"}\n')
+    assert is_incomplete_response(url, b'{"responseContext": {"serviceTrackingParams": [')
+    assert is_incomplete_response(url, b'{"error": {"code": 400}}')
+    assert is_incomplete_response(url, b"")
+
+    # Only the browse responses are checked
+    assert not is_incomplete_response("https://www.youtube.com/youtubei/v1/comment/create_comment", b"{")
+
+
+def test_token_bucket():
+    bucket = TokenBucket(10, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    assert 0.05 < bucket.reserve() <= 0.1
+
+    bucket.throttled()
+    assert bucket.rate == 5
+
+    limiter = RateLimiter(rate=100, endpoint_rates={"BROWSE_ENDPOINT": 20})
+    assert len(limiter.get_buckets("https://www.youtube.com/youtubei/v1/browse")) == 2
+    assert len(limiter.get_buckets("https://www.youtube.com/post/abc")) == 1
+
+
+def test_retries():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/youtubei/v1/browse"
+
+    try:
+        client = Client(backend="memory", rate_limiter=RateLimiter(rate=50), retries=2, backoff=0.01)
+
+        # The 429 is retried
+        r = client.post(url + "?full", json={"continuation": "a"})
+        assert r.status_code == 200
+        assert ThrottlingHandler.count == 2
+
+        # The incomplete response is retried and not kept in any cache
+        start = time.monotonic()
+        r = client.post(url + "?partial", json={"continuation": "b"})
+        assert r.status_code == 200
+        assert b"onResponseReceivedEndpoints" not in r.content
+        assert time.monotonic() - start < 5
+        assert ThrottlingHandler.count == 2 + 1 + 3
+        assert len(client.memory_cache.entries) == 1
+        assert len(list(client.cache.responses.keys())) == 1
+
+        # A valid page without items isn't retried nor taken as throttling
+        limiter = RateLimiter(rate=10)
+        client = Client(backend="memory", rate_limiter=limiter, retries=2, backoff=0.01)
+
+        r = client.post(url + "?empty", json={"continuation": "c"}, expire_after=60)
+        assert r.status_code == 200
+        assert ThrottlingHandler.count == 2 + 1 + 3 + 1
+        assert [bucket.rate for bucket in limiter.get_buckets(url)] == [10]
+        assert len(list(client.cache.responses.keys())) == 1
+    finally:
+        server.shutdown()
+
+
+def test_write_retries():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/youtubei/v1/comment/create_comment"
+
+    try:
+        client = Client(backend=None, retries=3, backoff=0.01)
+        count = ThrottlingHandler.count
+
+        # The writes are retried on throttling, but not after a server error or a timeout, which
+        # the server may have sent after applying them
+        r = client.post(url + "?error", json={})
+        assert r.status_code == 500
+        assert ThrottlingHandler.count == count + 2
+
+        try:
+            client.post(url + "?slow", json={}, timeout=0.2)
+            assert False
+        except requests.Timeout as e:
+            assert not is_connect_failure(e)
+        assert ThrottlingHandler.count == count + 4
+    finally:
+        server.shutdown()
+
+    # A refused connection never reached the server, it is retried
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+
+    try:
+        client.post(f"http://127.0.0.1:{port}/youtubei/v1/comment/create_comment", json={})
+        assert False
+    except requests.ConnectionError as e:
+        assert is_connect_failure(e)
+
+
+if __name__ == "__main__":
+    test_endpoints()
+    test_incomplete_response()
+    test_token_bucket()
+    test_retries()
+    test_write_retries()
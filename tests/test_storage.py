@@ -0,0 +1,40 @@
+import tempfile
+from pathlib import Path
+
+from youtube_community_tab import Storage, Post, Comment, Reply
+
+
+def test_storage(tmp_path):
+    storage = Storage(str(tmp_path / "storage.sqlite"))
+
+    posts = [Post(f"post_{i}", channel_id="channel_a", vote_count={"simpleText": str(i)}) for i in range(3)]
+    comment = Comment("post_0", "comment_0", channel_id="channel_a")
+    replies = [Reply(f"comment_0.reply_{i}") for i in range(2)]
+
+    storage.save_posts(posts)
+    storage.save_comments([comment])
+    storage.save_replies(comment, replies)
+
+    # Saving again updates the rows instead of duplicating them
+    posts[0].vote_count = {"simpleText": "10"}
+    storage.save_posts(posts[:1] + [Post("post_3", channel_id="channel_b")])
+
+    storage.close()
+
+    storage = Storage(str(tmp_path / "storage.sqlite"))
+
+    assert storage.get_post_ids("channel_a") == {"post_0", "post_1", "post_2"}
+    assert storage.get_post_ids("channel_b") == {"post_3"}
+    assert storage.get_post("post_0")["vote_count"] == {"simpleText": "10"}
+    assert storage.get_post("post_4") is None
+
+    assert [c["comment_id"] for c in storage.get_comments("post_0")] == ["comment_0"]
+    assert sorted(r["reply_id"] for r in storage.get_replies("comment_0")) == ["comment_0.reply_0", "comment_0.reply_1"]
+
+    # The lookups by channel and post use the indexes
+    plan = storage.query("EXPLAIN QUERY PLAN SELECT data FROM comments WHERE post_id = ?", ("post_0",))
+    assert "comments_post_id" in plan[0][-1]
+
+
+if __name__ == "__main__":
+    test_storage(Path(tempfile.mkdtemp()))